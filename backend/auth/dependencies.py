@@ -4,6 +4,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.auth.utils import verify_token
+from app.config import get_settings
 
 # HTTP Bearer scheme for JWT tokens
 security = HTTPBearer()
@@ -41,3 +42,21 @@ async def get_current_user_id(
             detail=str(e) if str(e) else "Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def require_admin(user_id: str = Depends(get_current_user_id)) -> str:
+    """
+    Dependency that only admits users listed in the admin_user_ids setting.
+
+    Returns:
+        The admin's user ID
+
+    Raises:
+        HTTPException: 401 if the token is invalid, 403 if the user is not an admin
+    """
+    if user_id not in get_settings().admin_user_id_set:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user_id
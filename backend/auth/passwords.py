@@ -0,0 +1,78 @@
+"""Password hashing and verification off the event loop.
+
+bcrypt spends 100-300 ms of CPU per call; run inside an async handler it
+stalls every other request on the worker. Calls run on a dedicated thread
+pool instead (bcrypt releases the GIL), behind an admission controller that
+caps concurrent hashes, bounds the queue and records queue-wait times. The
+work factor comes from the `bcrypt_rounds` setting; hashes made with another
+cost are upgraded on the next successful sign-in.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from passlib.context import CryptContext
+
+from app.config import get_settings
+from app.services.admission import AdmissionController
+
+
+@lru_cache
+def get_pwd_context() -> CryptContext:
+    """Password context using the configured bcrypt cost."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=get_settings().bcrypt_rounds,
+    )
+
+
+def _build_password_admission() -> AdmissionController:
+    settings = get_settings()
+    return AdmissionController(
+        max_concurrency=settings.password_hash_concurrency,
+        max_queue=settings.password_hash_max_queue,
+        # Keyed by email: caps parallel attempts against one account
+        max_pending_per_user=settings.password_hash_max_pending_per_account,
+        queue_timeout=settings.password_hash_queue_timeout_seconds,
+        # Rejection messages are worded per endpoint by routers/auth.py
+        retry_after=settings.password_hash_retry_after_seconds,
+    )
+
+
+# Admission for bcrypt work in this worker process; stats are in /health
+password_admission = _build_password_admission()
+
+_executor = ThreadPoolExecutor(
+    max_workers=get_settings().password_hash_concurrency,
+    thread_name_prefix="bcrypt",
+)
+
+
+async def hash_password(password: str, account: str) -> str:
+    """Hash a new password.
+
+    Raises:
+        AdmissionRejected: if too many hashes are already queued
+    """
+    async with password_admission.admit(account):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, get_pwd_context().hash, password)
+
+
+async def verify_password(password: str, hashed_password: str, account: str) -> tuple[bool, str | None]:
+    """Check a password against its stored hash.
+
+    Returns:
+        (valid, new_hash) where new_hash is set when the stored hash used a
+        different cost and should be replaced
+
+    Raises:
+        AdmissionRejected: if too many hashes are already queued
+    """
+    async with password_admission.admit(account):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor, get_pwd_context().verify_and_update, password, hashed_password
+        )
@@ -1,13 +1,88 @@
 """Token utilities for JWT verification."""
 
+import hashlib
+import time
+from collections import OrderedDict
+
 from jose import jwt, JWTError
 from app.config import get_settings
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already verified tokens.
+
+    Keyed by the SHA-256 digest of the token, so raw tokens are not kept in
+    memory. An entry expires at the token's `exp` claim, and in any case
+    after `ttl_seconds`, so a changed secret takes effect within that time.
+    Only successfully verified tokens are stored.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> str | None:
+        """The cached user ID for a token, or None if unknown or expired."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, token: str, user_id: str, exp: float | None) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        self._entries[key] = (user_id, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count and hit-rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def _build_token_cache() -> VerifiedTokenCache:
+    settings = get_settings()
+    return VerifiedTokenCache(
+        max_entries=settings.token_cache_size,
+        ttl_seconds=settings.token_cache_ttl_seconds,
+    )
+
+
+# Verified tokens of this process, shared by every request
+token_cache = _build_token_cache()
+
+
 def verify_token(token: str) -> str | None:
     """
     Verify a JWT token and extract the user ID.
 
+    Tokens verified before are answered from `token_cache` without decoding.
+
     Args:
         token: The JWT token string to verify
 
@@ -17,6 +92,10 @@ def verify_token(token: str) -> str | None:
     Raises:
         Exception: If token verification fails
     """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
     settings = get_settings()
 
     try:
@@ -33,6 +112,7 @@ def verify_token(token: str) -> str | None:
         if user_id is None:
             raise Exception("Token missing user ID")
 
+        token_cache.put(token, user_id, payload.get("exp"))
         return user_id
 
     except JWTError as e:
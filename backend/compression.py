@@ -0,0 +1,214 @@
+"""Response compression middleware (zstd, brotli, gzip).
+
+The encoding is negotiated from the request's Accept-Encoding header, in the
+server preference order of the `compression_encodings` setting; encodings
+whose library is not installed are skipped. Complete responses smaller than
+`compression_min_size` bytes are sent as-is. Streamed responses are
+compressed chunk by chunk and flushed after every chunk, so clients still
+receive data as it is produced. Server-sent events, already encoded bodies
+and non-text content types are never compressed.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class _Compressor(ABC):
+    """Incremental compressor: `chunk` returns flushed output, `finish` the trailer."""
+
+    @abstractmethod
+    def chunk(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor(_Compressor):
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _BrotliCompressor(_Compressor):
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _ZstdCompressor(_Compressor):
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _available_encodings(
+    gzip_level: int, brotli_quality: int, zstd_level: int
+) -> dict[str, Callable[[], _Compressor]]:
+    encodings: dict[str, Callable[[], _Compressor]] = {
+        "gzip": lambda: _GzipCompressor(gzip_level),
+    }
+    if brotli is not None:
+        encodings["br"] = lambda: _BrotliCompressor(brotli_quality)
+    if zstandard is not None:
+        encodings["zstd"] = lambda: _ZstdCompressor(zstd_level)
+    return encodings
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Encodings the client accepts (q > 0); "*" is not expanded."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip())
+    return accepted
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith("text/") or any(
+        kind in content_type for kind in ("json", "xml", "javascript")
+    )
+
+
+class CompressionMiddleware:
+    """Compress HTTP response bodies with the best encoding the client accepts."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: str = "zstd,br,gzip",
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.min_size = min_size
+        available = _available_encodings(gzip_level, brotli_quality, zstd_level)
+        # Server preference order, restricted to installed libraries
+        self.encodings = [
+            (name, available[name])
+            for name in (e.strip() for e in encodings.split(","))
+            if name in available
+        ]
+        # Build one of each up front: an incomplete compressor fails at
+        # startup, not on the first large response
+        for _, factory in self.encodings:
+            factory()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for name, factory in self.encodings:
+            if name in accepted:
+                responder = _CompressingResponder(send, name, factory, self.min_size)
+                await self.app(scope, receive, responder.send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressingResponder:
+    """Wraps `send` for one response, deciding on compression at the first body message."""
+
+    def __init__(self, send: Send, encoding: str, factory: Callable[[], _Compressor], min_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._factory = factory
+        self._min_size = min_size
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if _compressible(Headers(raw=message.get("headers", []))):
+                self._start = message
+            else:
+                self._passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            start, self._start = self._start, None
+            if not more_body and len(body) < self._min_size:
+                # Small complete body: not worth compressing
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._compressor = self._factory()
+            start["headers"] = list(start.get("headers", []))
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Streamed: length unknown, sent chunked
+                del headers["Content-Length"]
+            else:
+                compressed = self._compressor.chunk(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(start)
+
+        output = self._compressor.chunk(body) if body else b""
+        if not more_body:
+            output += self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": output, "more_body": more_body})
@@ -24,12 +24,88 @@ class Settings(BaseSettings):
     chatkit_workflow_id: str = ""
     next_public_app_url: str = "http://localhost:3000"
     max_conversation_history: int = 50
+    history_token_budget: int = 4000
+    summary_model: str = "gpt-4o-mini"
+    summary_batch_size: int = 40
+    summary_max_words: int = 250
+    fast_path_enabled: bool = True
+    task_snapshot_limit: int = 30
+
+    # Chat admission control (per worker process)
+    chat_max_concurrency: int = 16
+    chat_max_queue: int = 64
+    chat_max_pending_per_user: int = 3
+    chat_queue_timeout_seconds: float = 10.0
+    chat_retry_after_seconds: int = 5
+
+    # Verified JWT cache (per worker process)
+    token_cache_size: int = 10000
+    token_cache_ttl_seconds: float = 300.0
+
+    # Password hashing (bcrypt cost and per-process thread pool admission)
+    bcrypt_rounds: int = 12
+    password_hash_concurrency: int = 4
+    password_hash_max_queue: int = 64
+    password_hash_max_pending_per_account: int = 2
+    password_hash_queue_timeout_seconds: float = 5.0
+    password_hash_retry_after_seconds: int = 2
+
+    # Agent run timeouts, retries and circuit breaker
+    agent_turn_timeout_seconds: float = 60.0
+    agent_tool_timeout_seconds: float = 15.0
+    agent_model_timeout_seconds: float = 30.0
+    agent_model_max_retries: int = 2
+    agent_connect_attempts: int = 3
+    agent_retry_base_delay_seconds: float = 0.2
+    agent_retry_max_delay_seconds: float = 2.0
+    agent_breaker_failure_threshold: int = 5
+    agent_breaker_recovery_seconds: float = 30.0
+    agent_parallel_tool_calls: bool = True
+
+    # Per-turn model routing
+    model_routing_enabled: bool = True
+    agent_fast_model: str = "gpt-4o-mini"
+    agent_strong_model: str = "gpt-4o"
+    model_routing_strong_score: int = 2
+    model_routing_long_message_tokens: int = 80
+    model_routing_long_history_messages: int = 30
+
+    # Response compression: encodings in server preference order
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # SQL monitoring: slow query log and N+1 detection (opt-in)
+    query_monitor_enabled: bool = False
+    slow_query_ms: int = 200
+    max_queries_per_request: int = 50
+    n_plus_one_threshold: int = 10
+    # Debug only: report each request's statement count in X-Query-Count
+    query_count_header: bool = False
+
+    # Admin endpoints: comma-separated user IDs allowed to use them
+    admin_user_ids: str = ""
+    # Sampling profiler: worker-wide profiles on demand; per-request
+    # profiling (X-Profile: 1 from an admin) only when enabled
+    profiler_max_seconds: int = 60
+    request_profiling_enabled: bool = False
+
+    # Tracing exporter: "openai", "console", "memory" or "none"
+    tracing_exporter: str = "openai"
 
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins as a list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def admin_user_id_set(self) -> frozenset[str]:
+        """Parse admin user IDs as a set."""
+        return frozenset(uid.strip() for uid in self.admin_user_ids.split(",") if uid.strip())
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.metrics import instrument_engine
 
 
 class Base(DeclarativeBase):
@@ -32,6 +33,7 @@ engine = create_async_engine(
     pool_pre_ping=True,
     connect_args={"ssl": ssl_context},
 )
+instrument_engine(engine)
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -53,7 +55,7 @@ async def get_db() -> AsyncSession:
 async def init_db() -> None:
     """Initialize database tables."""
     # Import all models so Base.metadata knows about them
-    from app.models import Task, Conversation, Message, User  # noqa: F401
+    from app.models import Task, Conversation, Message, User, RollingSummary, TurnUsage  # noqa: F401
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -1,31 +1,61 @@
 """FastAPI application entry point."""
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.compression import CompressionMiddleware
 from app.config import get_settings
 from app.database import init_db
+from app.metrics import MetricsMiddleware, metrics_endpoint
+from app.profiler import ProfilingMiddleware
+from app.services.tracing import configure_tracing
 
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"camera=(), microphone=(), geolocation=()"),
+]
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in _SECURITY_HEADERS)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-        return response
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses.
+
+    Pure ASGI: the headers are added to the `http.response.start` message,
+    replacing any the endpoint set, and the body (streamed or not) passes
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    header for header in message.get("headers", ())
+                    if header[0].lower() not in _SECURITY_HEADER_NAMES
+                ]
+                headers.extend(_SECURITY_HEADERS)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    configure_tracing()
     await init_db()
     yield
     # Shutdown
@@ -54,11 +84,39 @@ app.add_middleware(
 # Add security headers
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Compress large response bodies. Runs outside security headers and CORS, so
+# it sees their final headers, and inside profiling and metrics
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.compression_encodings,
+        min_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        zstd_level=settings.compression_zstd_level,
+    )
+
+# Per-request profiling for admins (X-Profile: 1); not installed unless enabled
+if settings.request_profiling_enabled:
+    app.add_middleware(ProfilingMiddleware, admin_user_ids=settings.admin_user_id_set)
+
+# Request metrics (outermost, so latency covers every other middleware)
+app.add_middleware(MetricsMiddleware, query_count_header=settings.query_count_header)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok"}
+    """Health check endpoint, including queue and auth cache metrics."""
+    from app.auth.passwords import password_admission
+    from app.auth.utils import token_cache
+    from app.services.admission import chat_admission
+    return {
+        "status": "ok",
+        "chat_admission": chat_admission.stats(),
+        "password_hashing": password_admission.stats(),
+        "token_cache": token_cache.stats(),
+    }
 
 
 @app.get("/db-test")
@@ -79,8 +137,10 @@ from app.routers import tasks  # noqa: E402
 from app.routers import chat  # noqa: E402
 from app.routers import chatkit  # noqa: E402
 from app.routers import auth  # noqa: E402
+from app.routers import admin  # noqa: E402
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(tasks.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 app.include_router(chatkit.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
@@ -0,0 +1,196 @@
+"""Prometheus metrics for the API, its database pool and the chat pipeline.
+
+`MetricsMiddleware` records request counts, latency and in-flight requests
+per route template (never the raw path, to keep label cardinality bounded)
+and the number of SQL statements each request issued. Pool gauges and the
+admission/auth cache counters are read only when /metrics is scraped, so
+they cost nothing per request. Metrics are per worker process.
+"""
+
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from prometheus_client.registry import Collector
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import query_monitor
+from app.query_monitor import RequestDbStats, request_db_stats, route_template
+
+HTTP_REQUESTS = Counter(
+    "todoo_http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "todoo_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "todoo_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "todoo_db_queries_per_request",
+    "SQL statements issued while serving one HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+
+CHAT_TURNS = Counter(
+    "todoo_chat_turns_total",
+    "Chat turns by path (fast or agent) and model tier.",
+    ["path", "tier"],
+)
+CHAT_ERRORS = Counter(
+    "todoo_chat_errors_total",
+    "Chat turns that failed, by HTTP status code.",
+    ["status"],
+)
+CHAT_TOOL_CALLS = Counter(
+    "todoo_chat_tool_calls_total",
+    "MCP tool calls made by the agent, by tool.",
+    ["tool"],
+)
+CHAT_TOKENS = Counter(
+    "todoo_chat_tokens_total",
+    "Model tokens used by chat turns, by model and kind.",
+    ["model", "kind"],
+)
+CHAT_MODEL_LATENCY = Histogram(
+    "todoo_chat_model_latency_seconds",
+    "Total model time of one agent run.",
+    ["model"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+
+
+class MetricsMiddleware:
+    """Record per-route request metrics (pure ASGI).
+
+    With `query_count_header` on (debug only), responses carry the number of
+    SQL statements issued before the response started in X-Query-Count.
+    """
+
+    def __init__(self, app: ASGIApp, query_count_header: bool = False) -> None:
+        self.app = app
+        self.query_count_header = query_count_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        recorded = False
+        stats = RequestDbStats(scope=scope)
+        token = request_db_stats.set(stats)
+
+        def record() -> None:
+            # Once per request, when the response is complete: background
+            # tasks run after that inside the same app call and must not
+            # count towards the route's latency, load or queries
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            query_monitor.report_request(stats)
+            stats.finished = True
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.query_count_header:
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-query-count", str(stats.queries).encode()),
+                    ]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Fallback for requests that failed before completing a response
+            record()
+            request_db_stats.reset(token)
+
+
+class _PoolCollector(Collector):
+    """Connection pool gauges, read at scrape time."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        for name, doc, value in (
+            ("todoo_db_pool_size", "Configured persistent connections.", pool.size()),
+            ("todoo_db_pool_checked_out", "Connections in use.", pool.checkedout()),
+            ("todoo_db_pool_checked_in", "Idle connections in the pool.", pool.checkedin()),
+            ("todoo_db_pool_overflow", "Connections beyond pool_size (negative while below).", pool.overflow()),
+        ):
+            yield GaugeMetricFamily(name, doc, value=value)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach per-request statement accounting and export the engine's pool gauges."""
+    query_monitor.instrument_engine(engine)
+    REGISTRY.register(_PoolCollector(engine))
+
+
+class _StatsCollector(Collector):
+    """Admission queue and auth cache counters, read at scrape time."""
+
+    def collect(self):
+        from app.auth.passwords import password_admission
+        from app.auth.utils import token_cache
+        from app.services.admission import chat_admission
+
+        for prefix, stats in (
+            ("todoo_chat_admission", chat_admission.stats()),
+            ("todoo_password_admission", password_admission.stats()),
+        ):
+            yield GaugeMetricFamily(f"{prefix}_active", "Requests holding a slot.", value=stats["active"])
+            yield GaugeMetricFamily(f"{prefix}_queued", "Requests waiting for a slot.", value=stats["queued"])
+            yield CounterMetricFamily(
+                f"{prefix}_admitted", "Requests admitted.", value=stats["admitted_total"]
+            )
+            rejected = CounterMetricFamily(
+                f"{prefix}_rejected", "Requests rejected, by reason.", labels=["reason"]
+            )
+            for reason, count in stats["rejected_total"].items():
+                rejected.add_metric([reason], count)
+            yield rejected
+            yield CounterMetricFamily(
+                f"{prefix}_wait_seconds", "Total time spent queued.", value=stats["wait_seconds_total"]
+            )
+
+        cache = token_cache.stats()
+        yield GaugeMetricFamily("todoo_token_cache_entries", "Cached verified tokens.", value=cache["entries"])
+        yield CounterMetricFamily("todoo_token_cache_hits", "Token cache hits.", value=cache["hits"])
+        yield CounterMetricFamily("todoo_token_cache_misses", "Token cache misses.", value=cache["misses"])
+
+
+REGISTRY.register(_StatsCollector())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve all metrics in the Prometheus text exposition format."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -3,5 +3,7 @@ from app.models.task import Task
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.user import User
+from app.models.summary import RollingSummary
+from app.models.usage import TurnUsage
 
-__all__ = ["Task", "Conversation", "Message", "User"]
+__all__ = ["Task", "Conversation", "Message", "User", "RollingSummary", "TurnUsage"]
@@ -0,0 +1,63 @@
+"""Rolling conversation summary database model."""
+
+from datetime import datetime
+
+from sqlalchemy import Text, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RollingSummary(Base):
+    """Summary of the messages that have aged out of a conversation's history window."""
+
+    __tablename__ = "conversation_summaries"
+
+    conversation_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    content: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+    token_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    message_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    summarized_through: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+    # Message ID at `summarized_through`, breaking ties between messages
+    # stored with the same timestamp (NULL on summaries written before it)
+    summarized_through_id: Mapped[str | None] = mapped_column(
+        UUID(as_uuid=False),
+        nullable=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RollingSummary(conversation_id={self.conversation_id}, "
+            f"message_count={self.message_count})>"
+        )
@@ -0,0 +1,63 @@
+"""Per-turn model usage database model."""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class TurnUsage(Base):
+    """Token usage and model latency of the agent run behind one assistant message."""
+
+    __tablename__ = "turn_usage"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    message_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("messages.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    conversation_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    model: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    cached_input_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    model_requests: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    model_latency_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("idx_turn_usage_user_created", "user_id", "created_at"),
+        Index("idx_turn_usage_conversation", "conversation_id"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TurnUsage(message_id={self.message_id}, model={self.model}, "
+            f"input_tokens={self.input_tokens}, output_tokens={self.output_tokens})>"
+        )
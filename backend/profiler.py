@@ -0,0 +1,189 @@
+"""On-demand statistical sampling profiler.
+
+A background thread snapshots the Python stack of every thread in this
+worker (`sys._current_frames()`) at a fixed interval and counts identical
+stacks. The output is in the collapsed-stack format read by flamegraph.pl,
+speedscope and similar tools: one "frame;frame;frame count" line per stack,
+root first. The event loop thread shows whichever coroutine was running at
+each sample, so a profile covers all requests served by the worker.
+
+Nothing runs unless a profile is requested: the sampler thread exists only
+for the duration of a profile, and `ProfilingMiddleware` is installed only
+when the `request_profiling_enabled` setting is on. At most one profile
+(worker-wide or per-request) runs per process; others get a 409.
+"""
+
+import asyncio
+import sys
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from uuid import uuid4
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.utils import verify_token
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already running in this process."""
+
+
+class SamplingProfiler:
+    """Samples all thread stacks on a background thread until stopped."""
+
+    def __init__(self, interval_seconds: float = 0.005, max_depth: int = 128):
+        self.interval_seconds = interval_seconds
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop sampling; the sampler thread is joined off the event loop."""
+        self._stop.set()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common())
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < self.max_depth:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                thread_name = names.get(thread_id)
+                if thread_name is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    thread_name = names.get(thread_id, str(thread_id))
+                frames.append(thread_name)
+                self._stacks[";".join(reversed(frames))] += 1
+            self.samples += 1
+
+
+_profiler_active = False
+
+
+@asynccontextmanager
+async def exclusive_profile(interval_seconds: float) -> AsyncIterator[SamplingProfiler]:
+    """Sample the worker for the duration of the block.
+
+    Raises:
+        ProfilerBusy: if another profile is running in this process
+    """
+    global _profiler_active
+    if _profiler_active:
+        raise ProfilerBusy("A profile is already running on this worker")
+    _profiler_active = True
+    try:
+        profiler = SamplingProfiler(interval_seconds)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            await profiler.stop()
+    finally:
+        _profiler_active = False
+
+
+async def profile_worker(seconds: float, interval_seconds: float) -> str:
+    """Profile everything this worker runs for `seconds`; return collapsed stacks.
+
+    Raises:
+        ProfilerBusy: if another profile is running in this process
+    """
+    async with exclusive_profile(interval_seconds) as profiler:
+        await asyncio.sleep(seconds)
+    return profiler.collapsed()
+
+
+class RequestProfileStore:
+    """The most recent per-request profiles, by ID."""
+
+    def __init__(self, max_items: int = 20):
+        self.max_items = max_items
+        self._items: OrderedDict[str, str] = OrderedDict()
+
+    def put(self, profile_id: str, collapsed: str) -> None:
+        self._items[profile_id] = collapsed
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get(self, profile_id: str) -> str | None:
+        return self._items.get(profile_id)
+
+
+request_profiles = RequestProfileStore()
+
+
+class ProfilingMiddleware:
+    """Profile single requests sent with `X-Profile: 1` by an admin.
+
+    Samples the worker while the request is in flight (so concurrent
+    requests show up too) and returns the stored profile's ID in the
+    X-Profile-Id response header; fetch it from the admin profiles endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, admin_user_ids: frozenset[str], interval_seconds: float = 0.001) -> None:
+        self.app = app
+        self.admin_user_ids = admin_user_ids
+        self.interval_seconds = interval_seconds
+
+    def _is_admin(self, authorization: str) -> bool:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            return verify_token(token) in self.admin_user_ids
+        except Exception:
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER) != "1" or not self._is_admin(headers.get("authorization", "")):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        profiler = None
+        try:
+            async with AsyncExitStack() as stack:
+                try:
+                    profiler = await stack.enter_async_context(exclusive_profile(self.interval_seconds))
+                except ProfilerBusy as e:
+                    response = JSONResponse({"detail": str(e)}, status_code=409)
+                    await response(scope, receive, send)
+                    return
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            # Read once the sampler thread has stopped
+            if profiler is not None:
+                request_profiles.put(profile_id, profiler.collapsed())
@@ -0,0 +1,157 @@
+"""Per-request SQL accounting, slow query log and N+1 detection.
+
+Every statement is counted against the HTTP request that issued it (the
+request context is set by `MetricsMiddleware` and inherited by SQLAlchemy's
+greenlets). When the `query_monitor_enabled` setting is on, statements are
+also timed and fingerprinted (literals and placeholders replaced, IN lists
+collapsed), and:
+
+- statements slower than `slow_query_ms` are logged with the route that ran them
+- requests issuing more than `max_queries_per_request` statements, or the
+  same fingerprint `n_plus_one_threshold` times or more, are logged as
+  likely N+1 patterns
+
+With the monitor off only the counter is attached to the engine.
+"""
+
+import logging
+import re
+import time
+from collections import Counter as Tally
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import Scope
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES = Counter(
+    "todoo_db_slow_queries_total",
+    "Statements slower than the slow_query_ms setting, by route.",
+    ["route"],
+)
+QUERY_HEAVY_REQUESTS = Counter(
+    "todoo_db_query_heavy_requests_total",
+    "Requests flagged for too many or repeated statements, by route and reason.",
+    ["route", "reason"],
+)
+
+
+@dataclass
+class RequestDbStats:
+    """SQL statements issued on behalf of the current request."""
+
+    queries: int = 0
+    scope: Scope | None = None
+    fingerprints: Tally[str] | None = None
+    # Set once the response is sent; later statements (background tasks) are not counted
+    finished: bool = False
+
+
+# Set by MetricsMiddleware; the SQLAlchemy greenlets inherit it
+request_db_stats: ContextVar[RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def route_template(scope: Scope | None) -> str:
+    """The matched route's path template, or "unmatched"."""
+    route = scope.get("route") if scope else None
+    return getattr(route, "path", None) or "unmatched"
+
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|\?|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Statement text with literals and parameters removed, for grouping."""
+    normalized = _LITERALS.sub("?", statement)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = request_db_stats.get()
+    if stats is not None and not stats.finished:
+        stats.queries += 1
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _drop_timer(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and exception_context.cursor is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def _monitor_query(slow_seconds: float):
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = request_db_stats.get()
+        if stats is None or stats.finished:
+            route, method = "-", "-"
+        else:
+            stats.queries += 1
+            if stats.fingerprints is None:
+                stats.fingerprints = Tally()
+            stats.fingerprints[fingerprint(statement)] += 1
+            route = route_template(stats.scope)
+            method = stats.scope["method"] if stats.scope else "-"
+
+        if elapsed >= slow_seconds:
+            SLOW_QUERIES.labels(route).inc()
+            logger.warning(
+                "Slow query (%.0f ms) in %s %s: %s",
+                elapsed * 1000, method, route, fingerprint(statement),
+            )
+
+    return after_cursor_execute
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach statement counting, plus timing and fingerprinting when the monitor is on."""
+    settings = get_settings()
+    if not settings.query_monitor_enabled:
+        event.listen(engine.sync_engine, "after_cursor_execute", _count_query)
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", _start_timer)
+    event.listen(engine.sync_engine, "handle_error", _drop_timer)
+    event.listen(
+        engine.sync_engine,
+        "after_cursor_execute",
+        _monitor_query(settings.slow_query_ms / 1000),
+    )
+
+
+def report_request(stats: RequestDbStats) -> None:
+    """Log a finished request that issued too many or repeated statements."""
+    if not stats.fingerprints:
+        return
+    settings = get_settings()
+    route = route_template(stats.scope)
+    method = stats.scope["method"] if stats.scope else "-"
+
+    if stats.queries > settings.max_queries_per_request:
+        QUERY_HEAVY_REQUESTS.labels(route, "query_count").inc()
+        logger.warning(
+            "%s %s issued %d queries (limit %d)",
+            method, route, stats.queries, settings.max_queries_per_request,
+        )
+
+    statement, repeats = stats.fingerprints.most_common(1)[0]
+    if repeats >= settings.n_plus_one_threshold:
+        QUERY_HEAVY_REQUESTS.labels(route, "repeated_statement").inc()
+        logger.warning(
+            "Possible N+1 in %s %s: statement ran %d times: %s",
+            method, route, repeats, statement,
+        )
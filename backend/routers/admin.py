@@ -0,0 +1,58 @@
+"""Admin-only diagnostics endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth.dependencies import require_admin
+from app.config import get_settings
+from app.profiler import ProfilerBusy, profile_worker, request_profiles
+from app.schemas.task import ErrorResponse
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    responses={
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        403: {"model": ErrorResponse, "description": "Not an admin"},
+    },
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    _: str = Depends(require_admin),
+) -> PlainTextResponse:
+    """
+    Sample every thread of this worker for `seconds` and return collapsed stacks.
+
+    The output feeds flamegraph.pl or speedscope directly. Only the worker
+    that receives this request is profiled.
+    """
+    max_seconds = get_settings().profiler_max_seconds
+    if seconds > max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must be at most {max_seconds}",
+        )
+    try:
+        collapsed = await profile_worker(seconds, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(collapsed)
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(
+    profile_id: str,
+    _: str = Depends(require_admin),
+) -> PlainTextResponse:
+    """Return a per-request profile by the ID from its X-Profile-Id header."""
+    collapsed = request_profiles.get(profile_id)
+    if collapsed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found on this worker",
+        )
+    return PlainTextResponse(collapsed)
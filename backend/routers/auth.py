@@ -2,21 +2,21 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
 
 from app.database import get_db
 from app.models.user import User
+from app.auth.passwords import hash_password, verify_password
 from app.auth.utils import create_token, verify_token
+from app.services.admission import AdmissionRejected
 
 router = APIRouter(
     prefix="/auth",
     tags=["Auth"],
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class SignUpRequest(BaseModel):
     email: str = Field(..., min_length=3)
@@ -34,32 +34,59 @@ class AuthResponse(BaseModel):
     accessToken: str
 
 
+# Wording for password hashing admission rejections, per endpoint (the only
+# copy: the admission controller's own messages are not shown)
+_BUSY_MESSAGES = {
+    "signup": (
+        "Sign-up is busy right now. Please try again shortly.",
+        "A sign-up for this email is already in progress.",
+    ),
+    "signin": (
+        "Sign-in is busy right now. Please try again shortly.",
+        "Too many sign-in attempts in progress for this account.",
+    ),
+}
+
+
+def _busy(e: AdmissionRejected, endpoint: str) -> HTTPException:
+    busy_message, user_limit_message = _BUSY_MESSAGES[endpoint]
+    return HTTPException(
+        status_code=e.status_code,
+        detail=user_limit_message if e.reason == "user_limit" else busy_message,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @router.post("/signup")
 async def signup(
     data: SignUpRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    """Register a new user."""
+    """Register a new user.
+
+    The user row is created with one INSERT ... ON CONFLICT (email) DO
+    NOTHING, so concurrent signups for the same email cannot both succeed.
+    """
     try:
-        # Check if email already exists
+        email = data.email.lower().strip()
+        try:
+            hashed_password = await hash_password(data.password, account=email)
+        except AdmissionRejected as e:
+            raise _busy(e, "signup")
+
         result = await db.execute(
-            select(User).where(User.email == data.email.lower().strip())
+            insert(User)
+            .values(email=email, name=data.name, hashed_password=hashed_password)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id, User.email, User.name, User.created_at)
         )
-        if result.scalar_one_or_none():
+        user = result.first()
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-
-        # Create user
-        user = User(
-            email=data.email.lower().strip(),
-            name=data.name,
-            hashed_password=pwd_context.hash(data.password),
-        )
-        db.add(user)
         await db.commit()
-        await db.refresh(user)
 
         # Generate JWT
         token = create_token(user.id)
@@ -85,17 +112,35 @@ async def signin(
     db: AsyncSession = Depends(get_db),
 ) -> AuthResponse:
     """Sign in with email and password."""
+    email = data.email.lower().strip()
     result = await db.execute(
-        select(User).where(User.email == data.email.lower().strip())
+        select(User.id, User.email, User.name, User.hashed_password, User.created_at)
+        .where(User.email == email)
     )
-    user = result.scalar_one_or_none()
+    user = result.first()
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password(
+                data.password, user.hashed_password, account=email
+            )
+        except AdmissionRejected as e:
+            raise _busy(e, "signin")
 
-    if not user or not pwd_context.verify(data.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    if new_hash:
+        # Stored hash used an older bcrypt cost: upgrade it transparently
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+        await db.commit()
+
     token = create_token(user.id)
 
     return AuthResponse(
@@ -1,6 +1,8 @@
 """Chat and conversation endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -11,9 +13,15 @@ from app.schemas.chat import (
     ConversationSummary,
     ConversationDetail,
     MessageResponse,
+    UsageReport,
+    UsageTotals,
+    ConversationUsage,
 )
 from app.schemas.task import ErrorResponse
+from app.services.admission import chat_admission, AdmissionRejected
 from app.services.chat_service import process_chat_message, ChatServiceError
+from app.services.summary_service import refresh_conversation_summary
+from app.services.usage_service import get_user_usage, list_conversation_usage
 from app.services.conversation_service import (
     list_user_conversations,
     get_conversation,
@@ -34,19 +42,24 @@ router = APIRouter(
     responses={
         400: {"model": ErrorResponse, "description": "Bad request"},
         403: {"model": ErrorResponse, "description": "Forbidden"},
+        429: {"model": ErrorResponse, "description": "Too many pending requests"},
         502: {"model": ErrorResponse, "description": "AI service unavailable"},
+        503: {"model": ErrorResponse, "description": "Chat capacity exhausted"},
     },
 )
 async def send_chat_message(
     user_id: str,
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
 ) -> ChatResponse:
     """Send a message to the AI chatbot and receive a response.
 
     Creates a new conversation if no conversation_id is provided,
-    or continues an existing conversation.
+    or continues an existing conversation. Once the conversation outgrows
+    the history window, its rolling summary is refreshed in the background.
+    Agent runs are admitted through a per-process concurrency limiter, and
+    the chat service opens its own short-lived database sessions.
     """
     # Verify the authenticated user matches the path user_id
     if current_user_id != user_id:
@@ -56,11 +69,17 @@ async def send_chat_message(
         )
 
     try:
-        return await process_chat_message(
-            db=db,
-            user_id=user_id,
-            message=request.message,
-            conversation_id=request.conversation_id,
+        async with chat_admission.admit(user_id):
+            response = await process_chat_message(
+                user_id=user_id,
+                message=request.message,
+                conversation_id=request.conversation_id,
+            )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+            headers={"Retry-After": str(e.retry_after)},
         )
     except ChatServiceError as e:
         raise HTTPException(
@@ -68,6 +87,12 @@ async def send_chat_message(
             detail=e.message,
         )
 
+    if response.history_truncated:
+        background_tasks.add_task(
+            refresh_conversation_summary, response.conversation_id, user_id
+        )
+    return response
+
 
 @router.get(
     "/{user_id}/conversations",
@@ -145,3 +170,32 @@ async def get_conversation_detail(
             for m in messages
         ],
     )
+
+
+@router.get(
+    "/{user_id}/usage",
+    response_model=UsageReport,
+    responses={
+        403: {"model": ErrorResponse, "description": "Forbidden"},
+    },
+)
+async def get_usage(
+    user_id: str,
+    since: datetime | None = Query(default=None, description="Only count turns after this time"),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> UsageReport:
+    """Get the user's model token usage, in total and per conversation."""
+    if current_user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this resource",
+        )
+
+    totals = await get_user_usage(db, user_id, since)
+    conversations = await list_conversation_usage(db, user_id, since, limit)
+    return UsageReport(
+        totals=UsageTotals(**totals),
+        conversations=[ConversationUsage(**c) for c in conversations],
+    )
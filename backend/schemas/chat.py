@@ -51,6 +51,14 @@ class ChatResponse(BaseModel):
         default_factory=list,
         description="List of tool calls invoked during this exchange",
     )
+    history_messages: int = Field(
+        default=0,
+        description="Number of prior messages sent to the assistant as context",
+    )
+    history_truncated: bool = Field(
+        default=False,
+        description="Whether older messages were left out to fit the context budget",
+    )
 
 
 class MessageResponse(BaseModel):
@@ -77,3 +85,30 @@ class ConversationDetail(BaseModel):
     created_at: datetime
     updated_at: datetime
     messages: list[MessageResponse]
+
+
+class UsageTotals(BaseModel):
+    """Schema for aggregated model usage."""
+
+    turns: int
+    input_tokens: int
+    cached_input_tokens: int
+    output_tokens: int
+    model_requests: int
+    model_latency_ms: int
+
+
+class ConversationUsage(UsageTotals):
+    """Schema for model usage of a single conversation."""
+
+    conversation_id: str
+
+
+class UsageReport(BaseModel):
+    """Schema for a user's usage rollup."""
+
+    totals: UsageTotals
+    conversations: list[ConversationUsage] = Field(
+        default_factory=list,
+        description="Most expensive conversations first",
+    )
@@ -0,0 +1,193 @@
+"""Per-process admission control for agent runs.
+
+Caps the number of concurrent chat turns in this worker. Requests beyond the
+cap wait in per-user queues that are served round-robin, so one user sending
+a burst of messages cannot starve everyone else. Requests are rejected fast
+when a user has too many pending turns, when the queue is full, or when the
+wait exceeds the configured limit.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+
+from app.config import get_settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries the HTTP response details."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int, reason: str = ""):
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+        # "user_limit", "queue_full" or "timeout"
+        self.reason = reason
+        super().__init__(message)
+
+
+class AdmissionController:
+    """Concurrency limiter with per-user fair queuing."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_pending_per_user: int,
+        queue_timeout: float,
+        retry_after: int,
+        busy_message: str = "The assistant is busy right now. Please try again shortly.",
+        user_limit_message: str = "Too many chat requests in progress. Please wait for a reply.",
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_pending_per_user = max_pending_per_user
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.busy_message = busy_message
+        self.user_limit_message = user_limit_message
+
+        self._active = 0
+        self._queued = 0
+        # Users with waiting requests, in round-robin order
+        self._waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        # Active + queued requests per user
+        self._pending: defaultdict[str, int] = defaultdict(int)
+
+        self._admitted_total = 0
+        self._rejected_total: defaultdict[str, int] = defaultdict(int)
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def admit(self, user_id: str) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: 429 if the user has too many pending requests,
+                503 if the queue is full or the wait timed out
+        """
+        await self._acquire(user_id)
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+    def stats(self) -> dict:
+        """Current queue depth, concurrency and wait-time counters."""
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "queued_users": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "admitted_total": self._admitted_total,
+            "rejected_total": dict(self._rejected_total),
+            "wait_seconds_total": round(self._wait_seconds_total, 6),
+            "wait_seconds_max": round(self._wait_seconds_max, 6),
+        }
+
+    def _reject(self, reason: str, message: str, status_code: int) -> AdmissionRejected:
+        self._rejected_total[reason] += 1
+        return AdmissionRejected(message, status_code, self.retry_after, reason)
+
+    def _record_admission(self, waited: float) -> None:
+        self._admitted_total += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+    async def _acquire(self, user_id: str) -> None:
+        if self._pending[user_id] >= self.max_pending_per_user:
+            raise self._reject(
+                "user_limit",
+                self.user_limit_message,
+                status_code=429,
+            )
+
+        # Fast path: free slot and nobody ahead of us
+        if self._active < self.max_concurrency and not self._queued:
+            self._active += 1
+            self._pending[user_id] += 1
+            self._record_admission(0.0)
+            return
+
+        if self._queued >= self.max_queue:
+            raise self._reject(
+                "queue_full",
+                self.busy_message,
+                status_code=503,
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user_id, deque()).append(future)
+        self._queued += 1
+        self._pending[user_id] += 1
+        started = time.monotonic()
+
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except BaseException as exc:
+            if future.done() and not future.cancelled():
+                # Granted at the moment we gave up: pass the slot on
+                self._release(user_id)
+            else:
+                self._dequeue(user_id, future)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._reject(
+                    "timeout",
+                    self.busy_message,
+                    status_code=503,
+                ) from None
+            raise
+
+        self._record_admission(time.monotonic() - started)
+
+    def _dequeue(self, user_id: str, future: asyncio.Future) -> None:
+        """Remove a waiter that gave up before being granted a slot."""
+        queue = self._waiters.get(user_id)
+        if queue and future in queue:
+            queue.remove(future)
+            self._queued -= 1
+            if not queue:
+                del self._waiters[user_id]
+        self._forget(user_id)
+
+    def _forget(self, user_id: str) -> None:
+        self._pending[user_id] -= 1
+        if self._pending[user_id] <= 0:
+            del self._pending[user_id]
+
+    def _release(self, user_id: str) -> None:
+        self._active -= 1
+        self._forget(user_id)
+        self._grant_next()
+
+    def _grant_next(self) -> None:
+        """Hand free slots to the next waiting users in round-robin order."""
+        while self._active < self.max_concurrency and self._waiters:
+            user_id, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._waiters.move_to_end(user_id)
+            else:
+                del self._waiters[user_id]
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
+
+
+def _build_chat_admission() -> AdmissionController:
+    settings = get_settings()
+    return AdmissionController(
+        max_concurrency=settings.chat_max_concurrency,
+        max_queue=settings.chat_max_queue,
+        max_pending_per_user=settings.chat_max_pending_per_user,
+        queue_timeout=settings.chat_queue_timeout_seconds,
+        retry_after=settings.chat_retry_after_seconds,
+    )
+
+
+# Shared controller for the chat endpoint in this worker process
+chat_admission = _build_chat_admission()
@@ -1,7 +1,10 @@
 """OpenAI Agent configuration for the Todoo chatbot."""
 
-from agents import Agent, ModelSettings
+from functools import lru_cache
+
+from agents import Agent, ModelSettings, custom_span, set_default_openai_client
 from agents.mcp import MCPServerStreamableHttp
+from openai import AsyncOpenAI
 
 from app.config import get_settings
 
@@ -25,9 +28,18 @@ You can help users:
 
 ## Multi-Step Operations
 - When a user asks you to perform multiple operations in one message (e.g., "add three tasks: A, B, and C"), execute each operation and report the results for each step.
+- For the same operation on several tasks, use the batch tools (add_tasks, complete_tasks, delete_tasks) with all items in one call; each item's result is reported separately.
+- Other operations that do not depend on each other's results should be issued together as parallel tool calls in a single step.
 - If some operations succeed and others fail, report which succeeded and which failed.
 - Handle partial failures gracefully without stopping the remaining operations.
 
+## Task Snapshot
+- Each request includes a snapshot of the user's tasks (id, status, title), open tasks first.
+- Answer questions about the user's tasks from the snapshot when it covers them; only call list_tasks when the snapshot says more tasks exist than are shown and you need them.
+- When a task appears in the snapshot, pass its id (task_id, or task_ids for batch tools) instead of matching by title.
+- list_tasks returns one page of tasks. When its response has "has_more": true, call it again with "next_cursor" as cursor until it is false before counting tasks or stating that a task does not exist.
+- list_tasks omits descriptions unless you pass include_description=true; pass it when the user asks what a task says or what they wrote for it.
+
 ## Important
 - Every tool requires a user_id parameter. This will be provided to you in the conversation context.
 - Never fabricate task data — only report what the tools return.
@@ -35,26 +47,62 @@ You can help users:
 """
 
 
-def create_agent(user_id: str) -> tuple[Agent, MCPServerStreamableHttp]:
+@lru_cache
+def _configure_model_client() -> None:
+    """Install the shared OpenAI client with per-request timeout and retries.
+
+    Individual model requests have no side effects, so the client's own
+    jittered exponential backoff is safe to use for them.
+    """
+    settings = get_settings()
+    set_default_openai_client(
+        AsyncOpenAI(
+            api_key=settings.openai_api_key or None,
+            timeout=settings.agent_model_timeout_seconds,
+            max_retries=settings.agent_model_max_retries,
+        )
+    )
+
+
+def create_agent(
+    user_id: str,
+    model: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[Agent, MCPServerStreamableHttp]:
     """Create an agent instance configured with MCP tools.
 
+    `model` is the model chosen for this turn; defaults to the fast model.
+    `headers` are sent with every MCP request; pass `trace_headers()` taken
+    under the span the tool calls should nest under (the spans opened here
+    close before any tool runs).
+
     Returns the Agent and the MCP server connection (for lifecycle management).
     """
     settings = get_settings()
 
-    mcp_server = MCPServerStreamableHttp(
-        name="todoo-mcp",
-        params={
-            "url": f"{settings.mcp_server_url}/mcp",
-        },
-    )
+    with custom_span("create_agent", data={"model": model}):
+        _configure_model_client()
 
-    agent = Agent(
-        name="Todoo Assistant",
-        instructions=f"{SYSTEM_INSTRUCTIONS}\n\nCurrent user_id: {user_id}",
-        mcp_servers=[mcp_server],
-        model="gpt-4o-mini",
-        model_settings=ModelSettings(temperature=0.3),
-    )
+        mcp_server = MCPServerStreamableHttp(
+            name="todoo-mcp",
+            params={
+                "url": f"{settings.mcp_server_url}/mcp",
+                "timeout": settings.agent_tool_timeout_seconds,
+                "headers": headers or {},
+            },
+            # Upper bound on each MCP request, i.e. each tool call
+            client_session_timeout_seconds=settings.agent_tool_timeout_seconds,
+        )
+
+        agent = Agent(
+            name="Todoo Assistant",
+            instructions=f"{SYSTEM_INSTRUCTIONS}\n\nCurrent user_id: {user_id}",
+            mcp_servers=[mcp_server],
+            model=model or settings.agent_fast_model,
+            model_settings=ModelSettings(
+                temperature=0.3,
+                parallel_tool_calls=settings.agent_parallel_tool_calls,
+            ),
+        )
 
     return agent, mcp_server
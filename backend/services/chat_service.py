@@ -1,20 +1,44 @@
 """Chat service orchestrating conversation flow with the AI agent."""
 
-from agents import Runner, ItemHelpers
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from agents import Runner, custom_span, trace
 
 from app.config import get_settings
+from app.database import async_session_maker
+from app.metrics import CHAT_ERRORS, CHAT_MODEL_LATENCY, CHAT_TOKENS, CHAT_TOOL_CALLS, CHAT_TURNS
 from app.services.agent import create_agent
+from app.services.intent_router import try_fast_path
+from app.services.model_router import ModelChoice, choose_model
+from app.services.resilience import agent_breaker, retry_async
+from app.services.task_service import TaskSnapshot, load_task_snapshot
+from app.services.tracing import trace_headers
+from app.services.usage_service import UsageHooks, UsageStats, usage_from_result
 from app.services.conversation_service import (
     create_conversation,
     get_conversation,
-    store_message,
-    load_conversation_history,
+    store_turn,
+    load_history_window,
+    get_conversation_summary,
 )
 from app.schemas.chat import ChatResponse, ToolCallInfo
 
 
+@dataclass
+class TurnContext:
+    """Everything the agent run needs, loaded before any model call."""
+
+    conversation_id: str
+    received_at: datetime
+    agent_input: list[dict] = field(default_factory=list)
+    history_messages: int = 0
+    history_truncated: bool = False
+    model_choice: ModelChoice | None = None
+    fast_response: ChatResponse | None = None
+
+
 class ChatServiceError(Exception):
     """Raised when the chat service encounters an error."""
 
@@ -24,54 +48,133 @@ class ChatServiceError(Exception):
         super().__init__(message)
 
 
-async def process_chat_message(
-    db: AsyncSession,
+async def _load_snapshot(user_id: str, limit: int) -> TaskSnapshot:
+    """Load the task snapshot with a dedicated short-lived session."""
+    async with async_session_maker() as db:
+        return await load_task_snapshot(db, user_id, limit)
+
+
+async def _load_context(
     user_id: str,
     message: str,
-    conversation_id: str | None = None,
-) -> ChatResponse:
-    """Process a user chat message and return an AI response.
+    conversation_id: str | None,
+) -> TurnContext:
+    """Phase 1: resolve the conversation and build the agent input.
 
-    1. Load or create conversation
-    2. Load bounded history
-    3. Run agent with history + new message
-    4. Persist user and assistant messages
-    5. Return response
+    Uses one short-lived session that is closed before the agent runs.
+    Simple task commands are answered here by the fast path.
     """
     settings = get_settings()
+    received_at = datetime.utcnow()
 
-    # Load or create conversation
-    if conversation_id:
-        conversation = await get_conversation(db, conversation_id, user_id)
-        if not conversation:
-            raise ChatServiceError(
-                "Conversation not found or access denied", status_code=403
-            )
-    else:
-        conversation = await create_conversation(db, user_id)
-
-    # Load bounded conversation history
-    history_messages = await load_conversation_history(
-        db, conversation.id, user_id, limit=settings.max_conversation_history
-    )
+    async with async_session_maker() as db:
+        # Load or create conversation
+        if conversation_id:
+            conversation = await get_conversation(db, conversation_id, user_id)
+            if not conversation:
+                raise ChatServiceError(
+                    "Conversation not found or access denied", status_code=403
+                )
+        else:
+            conversation = await create_conversation(db, user_id)
 
-    # Build input for the agent: history + new user message
-    agent_input = []
-    for msg in history_messages:
+        context = TurnContext(conversation_id=conversation.id, received_at=received_at)
+
+        # Simple, unambiguous task commands skip the model entirely
+        if settings.fast_path_enabled:
+            fast_result = await try_fast_path(db, user_id, message)
+            if fast_result:
+                await store_turn(
+                    db,
+                    conversation.id,
+                    user_id,
+                    message,
+                    fast_result.response,
+                    received_at=received_at,
+                )
+                context.fast_response = ChatResponse(
+                    conversation_id=conversation.id,
+                    response=fast_result.response,
+                    tool_calls=[fast_result.tool_call],
+                )
+                return context
+
+        # Load conversation history bounded by token budget and message count,
+        # and the task snapshot on its own session so both queries run at once
+        history, snapshot = await asyncio.gather(
+            load_history_window(
+                db,
+                conversation.id,
+                user_id,
+                token_budget=settings.history_token_budget,
+                max_messages=settings.max_conversation_history,
+            ),
+            _load_snapshot(user_id, settings.task_snapshot_limit),
+        )
+
+        # Older context that aged out of the window is carried by the rolling summary
+        summary = None
+        if history.truncated:
+            summary = await get_conversation_summary(db, conversation.id, user_id)
+
+    # Build input for the agent: summary + history + task snapshot + new user message.
+    # The snapshot changes often, so it goes last to keep the prefix stable.
+    agent_input = context.agent_input
+    if summary:
+        agent_input.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{summary.content}",
+        })
+    for msg in history.messages:
         agent_input.append({
             "role": msg.role,
             "content": msg.content,
         })
+    agent_input.append({
+        "role": "system",
+        "content": snapshot.render(),
+    })
     agent_input.append({
         "role": "user",
         "content": message,
     })
 
-    # Run the agent
-    agent, mcp_server = create_agent(user_id)
+    context.history_messages = len(history.messages)
+    context.history_truncated = history.truncated
+    context.model_choice = choose_model(message, history_messages=len(history.messages))
+    return context
+
+
+async def _run_agent(
+    user_id: str, agent_input: list[dict], model: str
+) -> tuple[str, list[ToolCallInfo], UsageStats]:
+    """Phase 2: run the agent. No database session is held here.
+
+    The run is bounded by the per-turn timeout and guarded by the circuit
+    breaker, which fails fast while the provider is unhealthy. Only the
+    idempotent MCP connect is retried here; tool calls may have side effects.
+    """
+    settings = get_settings()
+    hooks = UsageHooks()
     try:
-        async with mcp_server:
-            result = await Runner.run(agent, input=agent_input)
+        async with agent_breaker.call():
+            # Taken under the caller's run_agent span, which stays open for
+            # every tool call
+            agent, mcp_server = create_agent(user_id, model=model, headers=trace_headers())
+            with custom_span("mcp.connect"):
+                await retry_async(
+                    mcp_server.connect,
+                    attempts=settings.agent_connect_attempts,
+                    base_delay=settings.agent_retry_base_delay_seconds,
+                    max_delay=settings.agent_retry_max_delay_seconds,
+                )
+            try:
+                result = await asyncio.wait_for(
+                    Runner.run(agent, input=agent_input, hooks=hooks),
+                    timeout=settings.agent_turn_timeout_seconds,
+                )
+            finally:
+                await mcp_server.cleanup()
     except Exception as e:
         raise ChatServiceError(
             "The AI service is temporarily unavailable. Please try again in a moment.",
@@ -91,14 +194,79 @@ async def process_chat_message(
                 tool_result_text = str(item.output)[:200]
             tool_calls.append(ToolCallInfo(name=tool_name, result=tool_result_text))
 
-    # Persist user message
-    await store_message(db, conversation.id, user_id, "user", message)
+    return response_text, tool_calls, usage_from_result(result, str(agent.model), hooks)
+
+
+def _record_agent_turn(tier: str, tool_calls: list[ToolCallInfo], usage: UsageStats) -> None:
+    """Update the chat pipeline metrics for a completed agent run."""
+    CHAT_TURNS.labels("agent", tier).inc()
+    for call in tool_calls:
+        CHAT_TOOL_CALLS.labels(call.name).inc()
+    CHAT_TOKENS.labels(usage.model, "input").inc(usage.input_tokens)
+    CHAT_TOKENS.labels(usage.model, "cached_input").inc(usage.cached_input_tokens)
+    CHAT_TOKENS.labels(usage.model, "output").inc(usage.output_tokens)
+    CHAT_MODEL_LATENCY.labels(usage.model).observe(usage.model_latency_ms / 1000)
+
+
+async def process_chat_message(
+    user_id: str,
+    message: str,
+    conversation_id: str | None = None,
+) -> ChatResponse:
+    """Process a user chat message and return an AI response.
+
+    1. Load context: conversation, rolling summary, history within the token
+       budget and a task snapshot (simple commands are answered by the fast path)
+    2. Run agent with summary + history + task snapshot + new message, on the
+       model picked for this turn by the model router
+    3. Persist user and assistant messages with the turn's token usage
+    4. Return response
+
+    Phases 1 and 3 each use their own short-lived session, so no pooled
+    connection is held while the model is running. Each phase is a span of
+    one "Todoo chat turn" trace, which also holds the SDK's model and tool spans.
+    """
+    with trace(
+        "Todoo chat turn",
+        group_id=conversation_id,
+        metadata={"user_id": user_id},
+    ):
+        try:
+            with custom_span("load_context"):
+                context = await _load_context(user_id, message, conversation_id)
+            if context.fast_response:
+                CHAT_TURNS.labels("fast", "none").inc()
+                return context.fast_response
+
+            choice = context.model_choice
+            with custom_span(
+                "run_agent",
+                data={"model": choice.model, "tier": choice.tier, "reasons": choice.reasons},
+            ):
+                response_text, tool_calls, usage = await _run_agent(
+                    user_id, context.agent_input, choice.model
+                )
+        except ChatServiceError as e:
+            CHAT_ERRORS.labels(str(e.status_code)).inc()
+            raise
+        _record_agent_turn(choice.tier, tool_calls, usage)
 
-    # Persist assistant response
-    await store_message(db, conversation.id, user_id, "assistant", response_text)
+        with custom_span("persist_turn"):
+            async with async_session_maker() as db:
+                await store_turn(
+                    db,
+                    context.conversation_id,
+                    user_id,
+                    message,
+                    response_text,
+                    received_at=context.received_at,
+                    usage=usage,
+                )
 
     return ChatResponse(
-        conversation_id=conversation.id,
+        conversation_id=context.conversation_id,
         response=response_text,
         tool_calls=tool_calls,
+        history_messages=context.history_messages,
+        history_truncated=context.history_truncated,
     )
@@ -1,15 +1,34 @@
 """Conversation and message persistence service."""
 
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from uuid import uuid4
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.conversation import Conversation
 from app.models.message import Message
+from app.models.summary import RollingSummary
+from app.models.usage import TurnUsage
+from app.services.tokens import count_tokens
+from app.services.tracing import traced
+from app.services.usage_service import UsageStats
 
 
+@dataclass
+class HistoryWindow:
+    """Messages selected for the agent prompt plus truncation metadata."""
+
+    messages: list[Message] = field(default_factory=list)
+    total_messages: int = 0
+    token_count: int = 0
+    truncated: bool = False
+
+
+@traced("conversation.create_conversation")
 async def create_conversation(db: AsyncSession, user_id: str) -> Conversation:
     """Create a new conversation for the user."""
     conversation = Conversation(
@@ -22,6 +41,7 @@ async def create_conversation(db: AsyncSession, user_id: str) -> Conversation:
     return conversation
 
 
+@traced("conversation.get_conversation")
 async def get_conversation(
     db: AsyncSession, conversation_id: str, user_id: str
 ) -> Conversation | None:
@@ -47,6 +67,7 @@ async def list_user_conversations(
     return list(result.scalars().all())
 
 
+@traced("conversation.store_message")
 async def store_message(
     db: AsyncSession,
     conversation_id: str,
@@ -61,6 +82,7 @@ async def store_message(
         user_id=user_id,
         role=role,
         content=content,
+        token_count=count_tokens(content),
     )
     db.add(message)
 
@@ -79,6 +101,71 @@ async def store_message(
     return message
 
 
+@traced("conversation.store_turn")
+async def store_turn(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    user_content: str,
+    assistant_content: str,
+    received_at: datetime,
+    usage: UsageStats | None = None,
+) -> None:
+    """Store a user message and the assistant reply in a single commit.
+
+    The user message is timestamped when it was received, so it always sorts
+    before the reply even though both are written after the agent run. The
+    model usage of the turn, if given, is written in the same commit.
+    """
+    replied_at = max(datetime.utcnow(), received_at + timedelta(microseconds=1))
+    assistant_message_id = str(uuid4())
+    db.add_all([
+        Message(
+            id=str(uuid4()),
+            conversation_id=conversation_id,
+            user_id=user_id,
+            role="user",
+            content=user_content,
+            token_count=count_tokens(user_content),
+            created_at=received_at,
+        ),
+        Message(
+            id=assistant_message_id,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            role="assistant",
+            content=assistant_content,
+            token_count=count_tokens(assistant_content),
+            created_at=replied_at,
+        ),
+    ])
+    if usage is not None:
+        db.add(TurnUsage(
+            message_id=assistant_message_id,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            model=usage.model,
+            input_tokens=usage.input_tokens,
+            cached_input_tokens=usage.cached_input_tokens,
+            output_tokens=usage.output_tokens,
+            model_requests=usage.model_requests,
+            model_latency_ms=usage.model_latency_ms,
+            created_at=replied_at,
+        ))
+
+    # Update conversation's updated_at timestamp
+    await db.execute(
+        update(Conversation)
+        .where(
+            Conversation.id == conversation_id,
+            Conversation.user_id == user_id,
+        )
+        .values(updated_at=replied_at)
+    )
+
+    await db.commit()
+
+
 async def load_conversation_history(
     db: AsyncSession,
     conversation_id: str,
@@ -101,3 +188,157 @@ async def load_conversation_history(
     messages = list(result.scalars().all())
     messages.reverse()  # Restore chronological order
     return messages
+
+
+@traced("conversation.load_history_window")
+async def load_history_window(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    token_budget: int,
+    max_messages: int = 50,
+) -> HistoryWindow:
+    """Load the most recent messages that fit within a token budget.
+
+    A running sum of `token_count` (newest first) is computed in SQL, so only
+    the rows that fit are transferred. Rows are kept while the tokens of the
+    newer messages still fit; the first row that overflows the budget is
+    fetched only to detect truncation and is then discarded.
+    """
+    newest_first = (Message.created_at.desc(), Message.id.desc())
+    windowed = (
+        select(
+            Message,
+            func.sum(Message.token_count)
+            .over(order_by=newest_first, rows=(None, 0))
+            .label("running_tokens"),
+            func.count().over().label("total_messages"),
+        )
+        .where(
+            Message.conversation_id == conversation_id,
+            Message.user_id == user_id,
+        )
+        .subquery()
+    )
+    windowed_message = aliased(Message, windowed)
+
+    result = await db.execute(
+        select(
+            windowed_message,
+            windowed.c.running_tokens,
+            windowed.c.total_messages,
+        )
+        .where(windowed.c.running_tokens - windowed.c.token_count < token_budget)
+        .order_by(windowed.c.created_at.desc(), windowed.c.id.desc())
+        .limit(max_messages + 1)
+    )
+    rows = result.all()
+    if not rows:
+        return HistoryWindow()
+
+    window = HistoryWindow(total_messages=rows[0].total_messages)
+    for message, running_tokens, _ in rows[:max_messages]:
+        if running_tokens > token_budget:
+            break
+        window.messages.append(message)
+        window.token_count = running_tokens
+
+    window.messages.reverse()  # Restore chronological order
+    window.truncated = len(window.messages) < window.total_messages
+    return window
+
+
+@traced("conversation.get_conversation_summary")
+async def get_conversation_summary(
+    db: AsyncSession, conversation_id: str, user_id: str
+) -> RollingSummary | None:
+    """Get the rolling summary of a conversation, if one has been written."""
+    result = await db.execute(
+        select(RollingSummary).where(
+            RollingSummary.conversation_id == conversation_id,
+            RollingSummary.user_id == user_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def load_messages_between(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    after: datetime | None,
+    after_id: str | None,
+    before: datetime,
+    before_id: str,
+    limit: int,
+) -> list[Message]:
+    """Load messages strictly between two (created_at, id) positions, oldest first.
+
+    Messages of one turn can share a timestamp, so positions compare on the
+    message ID after the timestamp, matching the history window's order.
+    A summary without `after_id` (written before IDs were tracked) bounds on
+    the timestamp alone.
+    """
+    position = tuple_(Message.created_at, Message.id)
+    query = select(Message).where(
+        Message.conversation_id == conversation_id,
+        Message.user_id == user_id,
+        position < tuple_(before, literal(before_id, Message.id.type)),
+    )
+    if after is not None and after_id is not None:
+        query = query.where(position > tuple_(after, literal(after_id, Message.id.type)))
+    elif after is not None:
+        query = query.where(Message.created_at > after)
+
+    result = await db.execute(
+        query.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def save_conversation_summary(
+    db: AsyncSession,
+    conversation_id: str,
+    user_id: str,
+    content: str,
+    summarized_through: datetime,
+    summarized_through_id: str,
+    message_count: int,
+) -> None:
+    """Insert or advance the rolling summary of a conversation.
+
+    `summarized_through` and `summarized_through_id` are the position of the
+    last summarized message. The write is ignored if a concurrent summarizer
+    already advanced the summary past it, so summaries never move backwards.
+    """
+    values = {
+        "content": content,
+        "token_count": count_tokens(content),
+        "message_count": message_count,
+        "summarized_through": summarized_through,
+        "summarized_through_id": summarized_through_id,
+        "updated_at": datetime.utcnow(),
+    }
+    stmt = insert(RollingSummary).values(
+        conversation_id=conversation_id,
+        user_id=user_id,
+        **values,
+    )
+    current = RollingSummary.summarized_through
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RollingSummary.conversation_id],
+            set_=values,
+            where=or_(
+                current < stmt.excluded.summarized_through,
+                and_(
+                    current == stmt.excluded.summarized_through,
+                    or_(
+                        RollingSummary.summarized_through_id.is_(None),
+                        RollingSummary.summarized_through_id < stmt.excluded.summarized_through_id,
+                    ),
+                ),
+            ),
+        )
+    )
+    await db.commit()
@@ -0,0 +1,233 @@
+"""Deterministic fast path for simple task commands.
+
+Messages such as "show my tasks", "add task buy milk" or "complete buy milk"
+are parsed with a small grammar and executed directly against the tasks
+table, skipping the model round trip. Anything the grammar does not match
+with high confidence returns None and falls through to the agent.
+"""
+
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.schemas.chat import ToolCallInfo
+
+# Longest list rendered in a templated response
+MAX_LISTED_TASKS = 50
+
+_LIST_FILTERS = {
+    "completed": "completed",
+    "done": "completed",
+    "finished": "completed",
+    "incomplete": "incomplete",
+    "pending": "incomplete",
+    "open": "incomplete",
+    "remaining": "incomplete",
+}
+
+_TASK_NOUN = r"(?:task|todo|to-do)"
+
+_LIST_PATTERNS = [
+    re.compile(
+        r"^(?:show|list|display|view|get|what\s+are)(?:\s+me)?\s+(?:all\s+)?(?:of\s+)?my\s+"
+        r"(?:(?P<filter>" + "|".join(_LIST_FILTERS) + r")\s+)?" + _TASK_NOUN + r"s$",
+        re.IGNORECASE,
+    ),
+]
+_ADD_PATTERNS = [
+    re.compile(
+        r"^(?:add|create)\s+(?:a\s+)?(?:new\s+)?" + _TASK_NOUN
+        + r"(?:\s+(?:called|named|titled))?\s*:?\s+(?:to\s+)?(?P<title>.+)$",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"^add\s+(?P<title>.+?)\s+to\s+my\s+(?:" + _TASK_NOUN + r"s|" + _TASK_NOUN + r"\s+list|list)$",
+        re.IGNORECASE,
+    ),
+]
+_COMPLETE_PATTERNS = [
+    re.compile(
+        r"^(?:complete|finish|check\s+off)\s+(?:the\s+)?(?:" + _TASK_NOUN + r"\s+)?(?P<title>.+)$",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"^mark\s+(?:the\s+)?(?:" + _TASK_NOUN + r"\s+)?(?P<title>.+?)\s+(?:as\s+)?"
+        r"(?:done|complete|completed|finished)$",
+        re.IGNORECASE,
+    ),
+]
+_DELETE_PATTERNS = [
+    re.compile(
+        r"^(?:delete|remove)\s+(?:the\s+)?" + _TASK_NOUN + r"\s+(?P<title>.+)$",
+        re.IGNORECASE,
+    ),
+]
+
+# Titles that look like several items or a compound request go to the agent
+_AMBIGUOUS_TITLE = re.compile(r"[,;\n]|\b(?:and|then|also|all|every)\b", re.IGNORECASE)
+# New titles mentioning a date or time go to the agent, which can set the due
+# date instead of storing the wording as part of the title
+_SCHEDULE_WORDS = re.compile(
+    r"\b(?:today|tonight|tomorrow|yesterday|at|on|by|before|after|until|due|next|"
+    r"noon|midnight|morning|afternoon|evening|week|weekend|month|am|pm|"
+    r"mon|tue|wed|thu|fri|sat|sun|"
+    r"(?:mon|tues|wednes|thurs|fri|satur|sun)day)\b|\d{1,2}(?::\d{2})?\s*(?:am|pm)\b|\d{1,2}:\d{2}",
+    re.IGNORECASE,
+)
+_QUOTES = "'\"“”‘’`"
+
+
+@dataclass
+class Intent:
+    """A simple task command recognised by the fast-path grammar."""
+
+    action: str
+    title: str | None = None
+    filter: str = "all"
+
+
+@dataclass
+class FastPathResult:
+    """Templated response for a command executed without the agent."""
+
+    response: str
+    tool_call: ToolCallInfo
+
+
+def _clean_title(raw: str) -> str | None:
+    """Normalise a captured title, or return None if it is not clearly a single task."""
+    title = raw.strip().strip(_QUOTES).strip()
+    if not title or len(title) > 200 or _AMBIGUOUS_TITLE.search(title):
+        return None
+    return title
+
+
+def parse_intent(message: str) -> Intent | None:
+    """Parse a chat message into a simple task command, if it is one."""
+    text = " ".join(message.strip().split()).rstrip(".!?")
+    if text.lower().startswith("please "):
+        text = text[len("please "):]
+
+    for pattern in _LIST_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            status = (match.group("filter") or "").lower()
+            return Intent("list", filter=_LIST_FILTERS.get(status, "all"))
+
+    for action, patterns in (
+        ("add", _ADD_PATTERNS),
+        ("complete", _COMPLETE_PATTERNS),
+        ("delete", _DELETE_PATTERNS),
+    ):
+        for pattern in patterns:
+            match = pattern.match(text)
+            if match:
+                title = _clean_title(match.group("title"))
+                if title and action == "add" and _SCHEDULE_WORDS.search(title):
+                    return None
+                return Intent(action, title=title) if title else None
+
+    return None
+
+
+async def _find_unique_task(db: AsyncSession, user_id: str, title: str) -> Task | None:
+    """Find the user's task with exactly this title (case-insensitive), if unique."""
+    result = await db.execute(
+        select(Task)
+        .where(Task.user_id == user_id, func.lower(Task.title) == title.lower())
+        .limit(2)
+    )
+    tasks = result.scalars().all()
+    return tasks[0] if len(tasks) == 1 else None
+
+
+async def _list_tasks(db: AsyncSession, user_id: str, intent: Intent) -> FastPathResult:
+    query = select(Task.title, Task.completed).where(Task.user_id == user_id)
+    if intent.filter == "completed":
+        query = query.where(Task.completed == True)  # noqa: E712
+    elif intent.filter == "incomplete":
+        query = query.where(Task.completed == False)  # noqa: E712
+    result = await db.execute(query.order_by(Task.created_at.desc()))
+    rows = result.all()
+
+    label = "" if intent.filter == "all" else f"{intent.filter} "
+    if not rows:
+        response = f"You don't have any {label}tasks."
+    else:
+        lines = [f"You have {len(rows)} {label}task{'s' if len(rows) != 1 else ''}:"]
+        lines.extend(
+            f"- {'[x]' if completed else '[ ]'} {title}"
+            for title, completed in rows[:MAX_LISTED_TASKS]
+        )
+        if len(rows) > MAX_LISTED_TASKS:
+            lines.append(f"...and {len(rows) - MAX_LISTED_TASKS} more.")
+        response = "\n".join(lines)
+
+    return FastPathResult(
+        response=response,
+        tool_call=ToolCallInfo(name="list_tasks", result=f"{len(rows)} tasks"),
+    )
+
+
+async def _add_task(db: AsyncSession, user_id: str, intent: Intent) -> FastPathResult:
+    task = Task(user_id=user_id, title=intent.title)
+    db.add(task)
+    await db.commit()
+    return FastPathResult(
+        response=f"I've created a task called '{task.title}'.",
+        tool_call=ToolCallInfo(name="add_task", result=task.title),
+    )
+
+
+async def _complete_task(db: AsyncSession, user_id: str, intent: Intent) -> FastPathResult | None:
+    task = await _find_unique_task(db, user_id, intent.title)
+    if not task:
+        return None
+    if task.completed:
+        response = f"'{task.title}' is already marked as complete."
+    else:
+        await db.execute(
+            update(Task).where(Task.id == task.id, Task.user_id == user_id).values(completed=True)
+        )
+        await db.commit()
+        response = f"I've marked '{task.title}' as complete."
+    return FastPathResult(
+        response=response,
+        tool_call=ToolCallInfo(name="complete_task", result=task.title),
+    )
+
+
+async def _delete_task(db: AsyncSession, user_id: str, intent: Intent) -> FastPathResult | None:
+    task = await _find_unique_task(db, user_id, intent.title)
+    if not task:
+        return None
+    await db.execute(delete(Task).where(Task.id == task.id, Task.user_id == user_id))
+    await db.commit()
+    return FastPathResult(
+        response=f"I've deleted the task '{task.title}'.",
+        tool_call=ToolCallInfo(name="delete_task", result=task.title),
+    )
+
+
+_HANDLERS = {
+    "list": _list_tasks,
+    "add": _add_task,
+    "complete": _complete_task,
+    "delete": _delete_task,
+}
+
+
+async def try_fast_path(db: AsyncSession, user_id: str, message: str) -> FastPathResult | None:
+    """Execute a simple task command directly, or return None to defer to the agent.
+
+    Commands that reference a task are only handled when exactly one of the
+    user's tasks has that title; missing or ambiguous matches go to the agent,
+    which can ask a clarifying question.
+    """
+    intent = parse_intent(message)
+    if intent is None:
+        return None
+    return await _HANDLERS[intent.action](db, user_id, intent)
@@ -0,0 +1,74 @@
+"""Per-turn model selection from cheap local signals.
+
+Short confirmations and single-operation commands go to the fast model;
+long, multi-step or planning-style requests go to the strong model. Only
+local heuristics are used, so routing adds no latency to the turn.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from app.config import get_settings
+from app.services.intent_router import parse_intent
+from app.services.tokens import count_tokens
+
+_CONFIRMATION = re.compile(
+    r"^(?:yes|yeah|yep|yup|no|nope|ok|okay|sure|thanks|thank you|do it|go ahead|"
+    r"cancel|never ?mind|sounds good|perfect|great)\b[\s.!]*$",
+    re.IGNORECASE,
+)
+_ACTION_VERBS = re.compile(
+    r"\b(?:add|create|list|show|update|rename|change|edit|complete|finish|mark|delete|remove)\b",
+    re.IGNORECASE,
+)
+_STEP_SEPARATORS = re.compile(r",|;|\n|\b(?:and|then|also|after that)\b", re.IGNORECASE)
+_REASONING_WORDS = re.compile(
+    r"\b(?:plan|organi[sz]e|prioriti[sz]e|summari[sz]e|schedule|suggest|recommend|"
+    r"group|categori[sz]e|compare|which of|why|explain|break down)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class ModelChoice:
+    """The model picked for a turn and the signals that picked it."""
+
+    model: str
+    tier: str
+    reasons: list[str] = field(default_factory=list)
+
+
+def choose_model(message: str, history_messages: int = 0) -> ModelChoice:
+    """Pick the fast or the strong model for a chat turn.
+
+    Each complexity signal adds a point (planning-style requests add two);
+    the strong model is used once the score reaches the configured threshold.
+    """
+    settings = get_settings()
+    if not settings.model_routing_enabled:
+        return ModelChoice(settings.agent_fast_model, "fast", ["routing disabled"])
+
+    text = message.strip()
+    if _CONFIRMATION.match(text):
+        return ModelChoice(settings.agent_fast_model, "fast", ["confirmation"])
+    if parse_intent(text) is not None:
+        return ModelChoice(settings.agent_fast_model, "fast", ["simple command"])
+
+    reasons = []
+    if count_tokens(text) > settings.model_routing_long_message_tokens:
+        reasons.append("long message")
+    if len(_ACTION_VERBS.findall(text)) >= 2:
+        reasons.append("several operations")
+    if len(_STEP_SEPARATORS.findall(text)) >= 2:
+        reasons.append("multi-step")
+    score = len(reasons)
+    if _REASONING_WORDS.search(text):
+        reasons.append("reasoning")
+        score += 2
+    if history_messages >= settings.model_routing_long_history_messages:
+        reasons.append("long history")
+        score += 1
+
+    if score >= settings.model_routing_strong_score:
+        return ModelChoice(settings.agent_strong_model, "strong", reasons)
+    return ModelChoice(settings.agent_fast_model, "fast", reasons)
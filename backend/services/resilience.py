@@ -0,0 +1,146 @@
+"""Retry and circuit-breaker helpers for calls to upstream AI services."""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TypeVar
+
+import httpx
+import openai
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+# Errors that mean the model provider or MCP server is unhealthy: timeouts,
+# connection failures, 5xx and rate limiting. Everything else is the
+# request's own problem and must not trip the breaker for everyone.
+UPSTREAM_FAILURES: tuple[type[BaseException], ...] = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+    openai.RateLimitError,
+    asyncio.TimeoutError,
+    httpx.TransportError,
+    ConnectionError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream dependency is unhealthy.
+
+    Closed: calls pass through; consecutive failures are counted.
+    Open: calls are refused until `recovery_timeout` seconds have passed.
+    Half-open: a single probe call is let through; success closes the
+    circuit, failure opens it again.
+
+    Only exceptions of `failure_types` count as upstream failures; anything
+    else (bad input, application errors) passes through without changing
+    the state.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: float,
+        failure_types: tuple[type[BaseException], ...] = (Exception,),
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failure_types = failure_types
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed now. Claims the probe slot when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probe_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def is_failure(self, exc: BaseException) -> bool:
+        """Whether an exception says the upstream is unhealthy."""
+        if isinstance(exc, BaseExceptionGroup):
+            return any(self.is_failure(inner) for inner in exc.exceptions)
+        return isinstance(exc, self.failure_types)
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """Guard a block: refuse it when open and record its outcome.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already running)
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("Circuit breaker is open")
+        try:
+            yield
+        except BaseException as exc:
+            if self.is_failure(exc):
+                self.record_failure()
+            else:
+                # Cancelled, or not the upstream's fault: state unchanged
+                self._probe_in_flight = False
+            raise
+        else:
+            self.record_success()
+
+
+async def retry_async(
+    operation: Callable[[], Awaitable[T]],
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+) -> T:
+    """Run an idempotent async operation, retrying failures with full-jitter backoff."""
+    for attempt in range(attempts):
+        try:
+            return await operation()
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            backoff = min(max_delay, base_delay * (2 ** attempt))
+            await asyncio.sleep(random.uniform(0, backoff))
+    raise ValueError("attempts must be at least 1")
+
+
+def _build_agent_breaker() -> CircuitBreaker:
+    settings = get_settings()
+    return CircuitBreaker(
+        failure_threshold=settings.agent_breaker_failure_threshold,
+        recovery_timeout=settings.agent_breaker_recovery_seconds,
+        failure_types=UPSTREAM_FAILURES,
+    )
+
+
+# Shared breaker for agent runs (model provider + MCP server) in this process
+agent_breaker = _build_agent_breaker()
@@ -0,0 +1,107 @@
+"""Background summarizer keeping a rolling summary of long conversations."""
+
+import logging
+
+from agents import Agent, ModelSettings, Runner
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models.message import Message
+from app.services.conversation_service import (
+    get_conversation_summary,
+    load_history_window,
+    load_messages_between,
+    save_conversation_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INSTRUCTIONS = """You maintain a running summary of a conversation between a user and the Todoo task management assistant.
+
+You receive the current summary (possibly empty) and a batch of older messages that are about to leave the assistant's context window. Produce an updated summary that:
+- Keeps facts the assistant may need later: tasks mentioned, changes made, user preferences and open questions.
+- Drops small talk and details that are no longer relevant.
+- Is written in the third person as plain prose, at most {max_words} words.
+
+Reply with the updated summary only."""
+
+# Conversations with a summarizer currently running in this process.
+_in_progress: set[str] = set()
+
+
+def _format_batch(previous_summary: str, messages: list[Message]) -> str:
+    """Render the summarizer prompt for one batch of aged-out messages."""
+    lines = [f"Current summary:\n{previous_summary or '(none)'}", "", "Messages:"]
+    lines.extend(f"{m.role}: {m.content}" for m in messages)
+    return "\n".join(lines)
+
+
+async def refresh_conversation_summary(conversation_id: str, user_id: str) -> None:
+    """Fold messages that aged out of the history window into the rolling summary.
+
+    Intended to run as a background task after a chat turn. Each batch is read
+    and written with its own short-lived session; the model call happens with
+    no session held. Failures are logged and retried on the next turn.
+    """
+    if conversation_id in _in_progress:
+        return
+
+    _in_progress.add(conversation_id)
+    try:
+        settings = get_settings()
+        summarizer = Agent(
+            name="Todoo Summarizer",
+            instructions=SUMMARY_INSTRUCTIONS.format(max_words=settings.summary_max_words),
+            model=settings.summary_model,
+            model_settings=ModelSettings(temperature=0.0),
+        )
+
+        while True:
+            async with async_session_maker() as db:
+                window = await load_history_window(
+                    db,
+                    conversation_id,
+                    user_id,
+                    token_budget=settings.history_token_budget,
+                    max_messages=settings.max_conversation_history,
+                )
+                if not window.truncated or not window.messages:
+                    return
+
+                summary = await get_conversation_summary(db, conversation_id, user_id)
+                aged_out = await load_messages_between(
+                    db,
+                    conversation_id,
+                    user_id,
+                    after=summary.summarized_through if summary else None,
+                    after_id=summary.summarized_through_id if summary else None,
+                    before=window.messages[0].created_at,
+                    before_id=window.messages[0].id,
+                    limit=settings.summary_batch_size,
+                )
+            if not aged_out:
+                return
+
+            previous = summary.content if summary else ""
+            result = await Runner.run(summarizer, input=_format_batch(previous, aged_out))
+            content = (result.final_output or "").strip()
+            if not content:
+                return
+
+            async with async_session_maker() as db:
+                await save_conversation_summary(
+                    db,
+                    conversation_id,
+                    user_id,
+                    content=content,
+                    summarized_through=aged_out[-1].created_at,
+                    summarized_through_id=aged_out[-1].id,
+                    message_count=(summary.message_count if summary else 0) + len(aged_out),
+                )
+
+            if len(aged_out) < settings.summary_batch_size:
+                return
+    except Exception:
+        logger.exception("Failed to refresh summary for conversation %s", conversation_id)
+    finally:
+        _in_progress.discard(conversation_id)
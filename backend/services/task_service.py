@@ -0,0 +1,52 @@
+"""Task queries shared by the chat pipeline."""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+
+
+@dataclass
+class TaskSnapshot:
+    """Compact view of a user's tasks for the agent prompt."""
+
+    tasks: list[tuple[str, str, bool]] = field(default_factory=list)
+    total_tasks: int = 0
+
+    def render(self) -> str:
+        """Render the snapshot as a compact prompt section."""
+        if not self.tasks:
+            return "The user currently has no tasks."
+        lines = [
+            f"The user's tasks (id | status | title), showing {len(self.tasks)} "
+            f"of {self.total_tasks}, open tasks first:"
+        ]
+        lines.extend(
+            f"{task_id} | {'done' if completed else 'open'} | {title}"
+            for task_id, title, completed in self.tasks
+        )
+        return "\n".join(lines)
+
+
+async def load_task_snapshot(db: AsyncSession, user_id: str, limit: int) -> TaskSnapshot:
+    """Load up to `limit` of the user's tasks, open tasks first, newest first."""
+    result = await db.execute(
+        select(
+            Task.id,
+            Task.title,
+            Task.completed,
+            func.count().over().label("total_tasks"),
+        )
+        .where(Task.user_id == user_id)
+        .order_by(Task.completed.asc(), Task.created_at.desc())
+        .limit(limit)
+    )
+    rows = result.all()
+    if not rows:
+        return TaskSnapshot()
+    return TaskSnapshot(
+        tasks=[(row.id, row.title, row.completed) for row in rows],
+        total_tasks=rows[0].total_tasks,
+    )
@@ -0,0 +1,13 @@
+"""Lightweight token estimation for chat messages."""
+
+# Rough average for English text with OpenAI tokenizers. Good enough for
+# budgeting history; the exact count is only known by the model provider.
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message overhead (role markers, separators) added by chat formats.
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens a message will cost in the prompt."""
+    return MESSAGE_TOKEN_OVERHEAD + (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
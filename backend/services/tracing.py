@@ -0,0 +1,108 @@
+"""Chat pipeline tracing built on the agents SDK tracing hooks.
+
+Stage spans (context loading, MCP connect, persistence, ...) are recorded as
+custom spans inside the same trace the SDK uses for model turns and tool
+calls, so one chat turn becomes one trace. The exporter is selected with the
+`tracing_exporter` setting:
+
+- "openai": the SDK default, exports to the OpenAI traces dashboard
+- "console": prints finished traces and spans to stdout
+- "memory": keeps the most recent spans in process, see `memory_exporter`
+- "none": tracing disabled
+"""
+
+import functools
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, ParamSpec, TypeVar
+
+from agents.tracing import (
+    Span,
+    Trace,
+    custom_span,
+    get_current_span,
+    get_current_trace,
+    set_trace_processors,
+    set_tracing_disabled,
+)
+from agents.tracing.processor_interface import TracingExporter
+from agents.tracing.processors import BatchTraceProcessor, ConsoleSpanExporter
+
+from app.config import get_settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Headers carrying the trace context to the MCP server
+TRACE_ID_HEADER = "x-todoo-trace-id"
+PARENT_SPAN_HEADER = "x-todoo-parent-span-id"
+
+
+class InMemorySpanExporter(TracingExporter):
+    """Keeps the most recently exported traces and spans for local inspection."""
+
+    def __init__(self, max_items: int = 1000):
+        self._items: deque[dict[str, Any]] = deque(maxlen=max_items)
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        for item in items:
+            exported = item.export()
+            if exported:
+                self._items.append(exported)
+
+    def items(self) -> list[dict[str, Any]]:
+        """Exported items, oldest first."""
+        return list(self._items)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+memory_exporter = InMemorySpanExporter()
+
+
+def configure_tracing() -> None:
+    """Install the exporter selected by the `tracing_exporter` setting."""
+    exporter_name = get_settings().tracing_exporter
+    if exporter_name == "none":
+        set_tracing_disabled(True)
+    elif exporter_name == "console":
+        set_trace_processors([BatchTraceProcessor(ConsoleSpanExporter())])
+    elif exporter_name == "memory":
+        set_trace_processors([BatchTraceProcessor(memory_exporter)])
+    elif exporter_name != "openai":
+        raise ValueError(f"Unknown tracing exporter: {exporter_name}")
+
+
+def traced(name: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Record each call of an async function as a custom span of the current trace."""
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with custom_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_headers() -> dict[str, str]:
+    """HTTP headers that let a downstream service nest its spans under the current span.
+
+    Sends the SDK's own IDs, plus a W3C `traceparent` derived from them for
+    collectors that understand only the standard header.
+    """
+    current_trace = get_current_trace()
+    if current_trace is None or not current_trace.trace_id.startswith("trace_"):
+        return {}
+
+    headers = {TRACE_ID_HEADER: current_trace.trace_id}
+    current_span = get_current_span()
+    if current_span is not None and current_span.span_id.startswith("span_"):
+        headers[PARENT_SPAN_HEADER] = current_span.span_id
+        trace_hex = current_trace.trace_id.removeprefix("trace_")[:32].rjust(32, "0")
+        span_hex = current_span.span_id.removeprefix("span_")[:16].rjust(16, "0")
+        headers["traceparent"] = f"00-{trace_hex}-{span_hex}-01"
+    return headers
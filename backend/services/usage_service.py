@@ -0,0 +1,109 @@
+"""Token usage and model latency accounting for chat turns."""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from agents import RunHooks
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.usage import TurnUsage
+
+
+@dataclass
+class UsageStats:
+    """Usage of one agent run, ready to be stored with the assistant message."""
+
+    model: str
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    model_requests: int = 0
+    model_latency_ms: int = 0
+
+
+class UsageHooks(RunHooks):
+    """Run hooks that time every model round trip of a single agent run."""
+
+    def __init__(self) -> None:
+        self.model_requests = 0
+        self.model_latency = 0.0
+        self._started_at: float | None = None
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self._started_at = time.perf_counter()
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        self.model_requests += 1
+        if self._started_at is not None:
+            self.model_latency += time.perf_counter() - self._started_at
+            self._started_at = None
+
+
+def usage_from_result(result: Any, model: str, hooks: UsageHooks) -> UsageStats:
+    """Sum the token usage of every model response in a run result."""
+    stats = UsageStats(
+        model=model,
+        model_requests=hooks.model_requests,
+        model_latency_ms=round(hooks.model_latency * 1000),
+    )
+    for response in result.raw_responses:
+        usage = response.usage
+        stats.input_tokens += usage.input_tokens
+        stats.output_tokens += usage.output_tokens
+        details = getattr(usage, "input_tokens_details", None)
+        stats.cached_input_tokens += getattr(details, "cached_tokens", 0) or 0
+    if not stats.model_requests:
+        stats.model_requests = len(result.raw_responses)
+    return stats
+
+
+async def get_user_usage(
+    db: AsyncSession, user_id: str, since: datetime | None = None
+) -> dict[str, int]:
+    """Total usage of a user, optionally since a point in time."""
+    query = select(
+        func.count(TurnUsage.id).label("turns"),
+        func.coalesce(func.sum(TurnUsage.input_tokens), 0).label("input_tokens"),
+        func.coalesce(func.sum(TurnUsage.cached_input_tokens), 0).label("cached_input_tokens"),
+        func.coalesce(func.sum(TurnUsage.output_tokens), 0).label("output_tokens"),
+        func.coalesce(func.sum(TurnUsage.model_requests), 0).label("model_requests"),
+        func.coalesce(func.sum(TurnUsage.model_latency_ms), 0).label("model_latency_ms"),
+    ).where(TurnUsage.user_id == user_id)
+    if since is not None:
+        query = query.where(TurnUsage.created_at >= since)
+
+    row = (await db.execute(query)).one()
+    return dict(row._mapping)
+
+
+async def list_conversation_usage(
+    db: AsyncSession,
+    user_id: str,
+    since: datetime | None = None,
+    limit: int = 20,
+) -> list[dict[str, Any]]:
+    """Per-conversation usage of a user, most expensive (total tokens) first."""
+    total_tokens = func.sum(TurnUsage.input_tokens + TurnUsage.output_tokens)
+    query = (
+        select(
+            TurnUsage.conversation_id,
+            func.count(TurnUsage.id).label("turns"),
+            func.sum(TurnUsage.input_tokens).label("input_tokens"),
+            func.sum(TurnUsage.cached_input_tokens).label("cached_input_tokens"),
+            func.sum(TurnUsage.output_tokens).label("output_tokens"),
+            func.sum(TurnUsage.model_requests).label("model_requests"),
+            func.sum(TurnUsage.model_latency_ms).label("model_latency_ms"),
+        )
+        .where(TurnUsage.user_id == user_id)
+        .group_by(TurnUsage.conversation_id)
+        .order_by(total_tokens.desc())
+        .limit(limit)
+    )
+    if since is not None:
+        query = query.where(TurnUsage.created_at >= since)
+
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
@@ -25,6 +25,10 @@ class Settings(BaseSettings):
     next_public_app_url: str = "http://localhost:3000"
     max_conversation_history: int = 50
 
+    # Verified JWT cache (per process; also used by the MCP server)
+    token_cache_size: int = 10000
+    token_cache_ttl_seconds: float = 300.0
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins as a list."""
@@ -0,0 +1,220 @@
+"""Short-lived per-user cache of read-only MCP tool results.
+
+An agent run often calls `list_tasks` several times with the same arguments.
+Read tools decorated with `cached_tool` serve repeats from memory, keyed by
+user, tool and arguments. Entries expire after MCP_TOOL_CACHE_TTL seconds
+(default 5; 0 disables the cache), and at most MCP_TOOL_CACHE_SIZE entries
+are kept, least recently used evicted first.
+
+A user's entries are dropped whenever their tasks change: locally when a
+tool decorated with `invalidates_cache` finishes, and in every worker and
+replica through the `todoo_task_changes` notifications sent by the tasks
+table trigger (migration 006), which also covers writes made by the REST
+API. The cache is only used while this worker is listening for those
+notifications, so it never serves results another process has changed.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, ParamSpec, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+CHANNEL = "todoo_task_changes"
+TRIGGER_NAME = "tasks_notify_change"
+
+# Reads slower than this cannot race an invalidation they have not seen
+_MAX_READ_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCache:
+    """TTL + LRU map of (user_id, tool, arguments) to a tool's JSON result."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, str]] = OrderedDict()
+        self._user_keys: dict[str, set[tuple[str, str, str]]] = {}
+        self._invalidated_at: dict[str, float] = {}
+
+    def get(self, key: tuple[str, str, str]) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple[str, str, str], value: str, started_at: float) -> None:
+        """Store a result, unless the user was invalidated after the read started."""
+        user_id = key[0]
+        if self._invalidated_at.get(user_id, float("-inf")) >= started_at:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        self._user_keys.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the user's entries and reject results of reads already in flight."""
+        now = time.monotonic()
+        for key in self._user_keys.pop(user_id, ()):
+            self._entries.pop(key, None)
+        self._invalidated_at[user_id] = now
+        if len(self._invalidated_at) > self.max_entries:
+            cutoff = now - _MAX_READ_SECONDS
+            self._invalidated_at = {u: t for u, t in self._invalidated_at.items() if t > cutoff}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._user_keys.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remove(self, key: tuple[str, str, str]) -> None:
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[0]]
+
+
+tool_cache = ToolResultCache(
+    max_entries=int(os.environ.get("MCP_TOOL_CACHE_SIZE", "2000")),
+    ttl_seconds=float(os.environ.get("MCP_TOOL_CACHE_TTL", "5")),
+)
+
+
+def _tool_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict[str, Any]:
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name != "ctx"}
+
+
+def cached_tool(func: Callable[P, Awaitable[str]]) -> Callable[P, Awaitable[str]]:
+    """Serve repeated calls of a read-only tool from `tool_cache`.
+
+    Apply below `@traced_tool`, so cache hits are still traced.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> str:
+        if not tool_cache.enabled:
+            return await func(*args, **kwargs)
+
+        arguments = _tool_arguments(signature, args, kwargs)
+        key = (
+            str(arguments.get("user_id")),
+            func.__name__,
+            json.dumps(arguments, sort_keys=True, default=str),
+        )
+        cached = tool_cache.get(key)
+        if cached is not None:
+            return cached
+
+        started_at = time.monotonic()
+        result = await func(*args, **kwargs)
+        tool_cache.put(key, result, started_at)
+        return result
+
+    return wrapper
+
+
+def invalidates_cache(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """Drop the user's cached tool results once a mutating tool finishes, even on failure."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            user_id = _tool_arguments(signature, args, kwargs).get("user_id")
+            tool_cache.invalidate(str(user_id))
+
+    return wrapper
+
+
+_listener: AsyncConnection | None = None
+
+
+def _on_notification(connection: Any, pid: int, channel: str, payload: str) -> None:
+    tool_cache.invalidate(payload)
+
+
+def _on_listener_lost(connection: Any) -> None:
+    tool_cache.enabled = False
+    tool_cache.clear()
+    logger.warning("Lost the %s listener; MCP tool cache disabled", CHANNEL)
+
+
+async def start_invalidation_listener(engine: AsyncEngine) -> None:
+    """LISTEN for task changes on a dedicated connection and enable the cache."""
+    global _listener
+    if tool_cache.ttl_seconds <= 0 or _listener is not None:
+        return
+    conn: AsyncConnection | None = None
+    try:
+        conn = await engine.connect()
+        trigger = await conn.scalar(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = :name"), {"name": TRIGGER_NAME}
+        )
+        # The pooled transaction is not needed; notifications arrive outside it
+        await conn.commit()
+        if trigger is None:
+            logger.warning("Trigger %s is missing (migration 006); MCP tool cache disabled", TRIGGER_NAME)
+            await conn.close()
+            return
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.add_listener(CHANNEL, _on_notification)
+        raw.add_termination_listener(_on_listener_lost)
+    except Exception as e:
+        if conn is not None:
+            await conn.close()
+        logger.warning("Could not listen on %s (%s); MCP tool cache disabled", CHANNEL, e)
+        return
+    _listener = conn
+    tool_cache.enabled = True
+
+
+async def stop_invalidation_listener() -> None:
+    """Disable the cache and release the listening connection."""
+    global _listener
+    tool_cache.enabled = False
+    tool_cache.clear()
+    if _listener is not None:
+        conn, _listener = _listener, None
+        raw = (await conn.get_raw_connection()).driver_connection
+        raw.remove_termination_listener(_on_listener_lost)
+        # Discard rather than return a connection that still LISTENs to the pool
+        await conn.invalidate()
+        await conn.close()
@@ -0,0 +1,147 @@
+"""Process-wide database engine for the MCP server.
+
+In stateless HTTP mode FastMCP enters the server lifespan once per request,
+so the engine must not be created there: it is built once per process,
+warmed up, and shared by every tool call. Settings come from environment
+variables:
+
+    DATABASE_URL                  asyncpg URL; sslmode/ssl/channel_binding
+                                  query params are handled like the backend
+    MCP_DB_POOL_SIZE              persistent connections per process (5)
+    MCP_DB_MAX_OVERFLOW           extra connections under load (10)
+    MCP_DB_POOL_TIMEOUT           seconds to wait for a free connection (10)
+    MCP_DB_POOL_RECYCLE           seconds before a connection is replaced (1800)
+    MCP_DB_STATEMENT_CACHE_SIZE   asyncpg prepared statement cache per
+                                  connection (100); use 0 behind PgBouncer
+    MCP_DB_WARMUP_CONNECTIONS     connections opened at startup (pool size)
+"""
+
+import asyncio
+import logging
+import os
+import ssl
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+# Query params asyncpg does not understand; SSL is configured via connect_args
+_SSL_PARAMS = ("sslmode", "ssl", "channel_binding")
+_SSL_REQUIRED = {"require", "verify-ca", "verify-full", "true", "1"}
+
+_engine: AsyncEngine | None = None
+_session_maker: async_sessionmaker[AsyncSession] | None = None
+_init_lock = asyncio.Lock()
+_warm_connections = 0
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def normalize_database_url(database_url: str) -> tuple[str, bool]:
+    """Strip SSL query params asyncpg rejects; return the URL and whether SSL was requested."""
+    url = make_url(database_url)
+    ssl_requested = any(
+        str(url.query.get(param, "")).lower() in _SSL_REQUIRED for param in ("sslmode", "ssl")
+    )
+    url = url.difference_update_query(_SSL_PARAMS)
+    return url.render_as_string(hide_password=False), ssl_requested
+
+
+def _create_engine() -> AsyncEngine:
+    db_url, ssl_requested = normalize_database_url(os.environ.get("DATABASE_URL", ""))
+    statement_cache_size = _env_int("MCP_DB_STATEMENT_CACHE_SIZE", 100)
+
+    connect_args: dict = {"statement_cache_size": statement_cache_size}
+    if ssl_requested:
+        # Same SSL context as the backend uses for Neon PostgreSQL
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        connect_args["ssl"] = ssl_context
+    if statement_cache_size == 0:
+        # Also disable SQLAlchemy's own prepared statement cache (PgBouncer)
+        db_url = make_url(db_url).update_query_dict(
+            {"prepared_statement_cache_size": "0"}
+        ).render_as_string(hide_password=False)
+
+    return create_async_engine(
+        db_url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=_env_int("MCP_DB_POOL_SIZE", 5),
+        max_overflow=_env_int("MCP_DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("MCP_DB_POOL_TIMEOUT", 10),
+        pool_recycle=_env_int("MCP_DB_POOL_RECYCLE", 1800),
+        connect_args=connect_args,
+    )
+
+
+async def _warm_up(engine: AsyncEngine, connections: int) -> int:
+    """Open `connections` pooled connections concurrently so first tool calls reuse them."""
+
+    async def open_one():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    # Hold every connection until all are open, so each one is a new pool entry
+    results = await asyncio.gather(*(open_one() for _ in range(connections)), return_exceptions=True)
+    opened = [r for r in results if not isinstance(r, BaseException)]
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        logger.warning("MCP database warm-up: %d connection(s) failed: %s", len(failures), failures[0])
+    for conn in opened:
+        await conn.close()
+    return len(opened)
+
+
+async def init_engine() -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    """Create (once per process) and warm up the shared engine."""
+    global _engine, _session_maker, _warm_connections
+    if _engine is not None:
+        return _engine, _session_maker
+
+    async with _init_lock:
+        if _engine is None:
+            engine = _create_engine()
+            warmup = _env_int("MCP_DB_WARMUP_CONNECTIONS", _env_int("MCP_DB_POOL_SIZE", 5))
+            if warmup > 0:
+                _warm_connections = await _warm_up(engine, warmup)
+            _session_maker = async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+            _engine = engine
+    return _engine, _session_maker
+
+
+async def dispose_engine() -> None:
+    """Close all pooled connections (process shutdown)."""
+    global _engine, _session_maker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_maker = None
+
+
+def pool_stats() -> dict:
+    """Connection pool gauges for the shared engine."""
+    if _engine is None:
+        return {"initialized": False}
+    pool = _engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "warmed_connections": _warm_connections,
+    }
@@ -0,0 +1,88 @@
+"""Concurrent tool-call load test for a running MCP server.
+
+Run from backend/ directory against a server started with `python -m mcp_server.run`:
+    python -m mcp_server.loadtest --url http://127.0.0.1:8001/mcp --user-id <id>
+
+Each virtual client opens its own MCP session and calls the tool in a loop,
+the same way separate backend pods do, so with several workers the calls
+are spread across processes. Pass --tool tools/list to exercise the
+transport without touching the database.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+
+async def _client(url: str, tool: str, arguments: dict, calls: int, latencies: list[float], errors: list[str]) -> None:
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for _ in range(calls):
+                started = time.perf_counter()
+                try:
+                    if tool == "tools/list":
+                        await session.list_tools()
+                    else:
+                        result = await session.call_tool(tool, arguments)
+                        if result.isError:
+                            errors.append(result.content[0].text if result.content else "tool error")
+                            continue
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, tool: str, arguments: dict, clients: int, calls: int) -> dict:
+    """Run `clients` concurrent sessions making `calls` calls each; return a latency summary."""
+    latencies: list[float] = []
+    errors: list[str] = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_client(url, tool, arguments, calls, latencies, errors) for _ in range(clients))
+    )
+    elapsed = time.perf_counter() - started
+
+    summary = {
+        "clients": clients,
+        "calls": clients * calls,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 2),
+        "calls_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+    if latencies:
+        latencies.sort()
+        summary["p50_ms"] = round(statistics.median(latencies) * 1000, 1)
+        summary["p95_ms"] = round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1)
+        summary["max_ms"] = round(latencies[-1] * 1000, 1)
+    if errors:
+        summary["first_error"] = errors[0]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8001/mcp")
+    parser.add_argument("--tool", default="list_tasks", help='tool name, or "tools/list"')
+    parser.add_argument("--user-id", default="", help="user_id argument for task tools")
+    parser.add_argument("--args", default="{}", help="extra tool arguments as JSON")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=20, help="calls per client")
+    options = parser.parse_args()
+
+    arguments = json.loads(options.args)
+    if options.user_id:
+        arguments.setdefault("user_id", options.user_id)
+    summary = asyncio.run(run(options.url, options.tool, arguments, options.clients, options.calls))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
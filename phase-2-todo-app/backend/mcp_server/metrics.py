@@ -0,0 +1,147 @@
+"""Prometheus metrics for the MCP server, served at GET /metrics.
+
+Tool calls are counted and timed per tool and outcome by `measured_tool`;
+HTTP requests per route by `MetricsMiddleware`. Pool gauges and tool-cache
+counters are read only when /metrics is scraped. Metrics are per worker
+process, so with MCP_WORKERS > 1 each scrape sees one worker.
+"""
+
+import functools
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import ParamSpec, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from prometheus_client.registry import Collector
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from mcp_server.cache import tool_cache
+from mcp_server.database import pool_stats
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+TOOL_CALLS = Counter(
+    "todoo_mcp_tool_calls_total",
+    "MCP tool calls by tool and outcome.",
+    ["tool", "outcome"],
+)
+TOOL_LATENCY = Histogram(
+    "todoo_mcp_tool_duration_seconds",
+    "MCP tool call latency by tool.",
+    ["tool"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 15),
+)
+HTTP_REQUESTS = Counter(
+    "todoo_mcp_http_requests_total",
+    "HTTP requests by route and status code.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "todoo_mcp_http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 15),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "todoo_mcp_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+
+
+def _returned_outcome(result: object) -> str:
+    """"error" for a tool response reporting `"success": false`, else "ok"."""
+    if isinstance(result, str):
+        try:
+            body = json.loads(result)
+        except ValueError:
+            return "ok"
+        if isinstance(body, dict) and body.get("success") is False:
+            return "error"
+    return "ok"
+
+
+def measured_tool(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """Count and time each call of an MCP tool. Apply right below `@mcp.tool()`.
+
+    Raised errors and returned failures (`"success": false`, e.g. a task not
+    found or a partly failed batch) are both counted with outcome "error".
+    """
+    name = func.__name__
+    latency = TOOL_LATENCY.labels(name)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+            outcome = _returned_outcome(result)
+            return result
+        finally:
+            latency.observe(time.perf_counter() - started)
+            TOOL_CALLS.labels(name, outcome).inc()
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """Record per-route HTTP metrics (pure ASGI)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUESTS.labels(scope["method"], route, str(status)).inc()
+            HTTP_LATENCY.labels(scope["method"], route).observe(time.perf_counter() - started)
+
+
+class _StatsCollector(Collector):
+    """Pool gauges and tool-cache counters, read at scrape time."""
+
+    def collect(self):
+        pool = pool_stats()
+        if pool["initialized"]:
+            yield GaugeMetricFamily("todoo_mcp_db_pool_size", "Configured persistent connections.", value=pool["size"])
+            yield GaugeMetricFamily("todoo_mcp_db_pool_checked_out", "Connections in use.", value=pool["checked_out"])
+            yield GaugeMetricFamily("todoo_mcp_db_pool_checked_in", "Idle connections.", value=pool["checked_in"])
+            yield GaugeMetricFamily(
+                "todoo_mcp_db_pool_overflow", "Connections beyond pool_size.", value=pool["overflow"]
+            )
+
+        cache = tool_cache.stats()
+        yield GaugeMetricFamily("todoo_mcp_tool_cache_enabled", "1 while the tool cache is in use.", value=int(cache["enabled"]))
+        yield GaugeMetricFamily("todoo_mcp_tool_cache_entries", "Cached tool results.", value=cache["entries"])
+        yield CounterMetricFamily("todoo_mcp_tool_cache_hits", "Tool cache hits.", value=cache["hits"])
+        yield CounterMetricFamily("todoo_mcp_tool_cache_misses", "Tool cache misses.", value=cache["misses"])
+
+
+REGISTRY.register(_StatsCollector())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve all metrics in the Prometheus text exposition format."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -2,8 +2,21 @@
 
 Run from backend/ directory:
     python -m mcp_server.run
+
+Serves the stateless streamable HTTP app under uvicorn with uvloop and
+httptools. Every tool call is independent, so any worker (or replica) can
+serve any request. Configuration:
+
+    MCP_SERVER_HOST            bind address (127.0.0.1; use 0.0.0.0 in containers)
+    MCP_SERVER_PORT            bind port (8001)
+    MCP_WORKERS                worker processes (CPU count, honoring cgroup quotas)
+    MCP_GRACEFUL_TIMEOUT       seconds to drain in-flight requests on shutdown (30)
+    MCP_KEEPALIVE_TIMEOUT      idle keep-alive seconds for backend connections (30)
+
+Each worker has its own database pool of MCP_DB_POOL_SIZE connections.
 """
 
+import math
 import os
 import sys
 
@@ -16,13 +29,40 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(backend_dir, ".env"))
 
 
+def available_cpus() -> int:
+    """CPUs this process may use: the cgroup v2 quota if set, else the affinity mask."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
 def main():
-    """Launch MCP server on configured port."""
-    port = int(os.environ.get("MCP_SERVER_PORT", "8001"))
+    """Launch the MCP server workers on the configured port."""
+    import uvicorn
 
-    from mcp_server.server import mcp_server
+    workers = int(os.environ.get("MCP_WORKERS", available_cpus()))
 
-    mcp_server.run(transport="streamable-http", port=port)
+    uvicorn.run(
+        "mcp_server.server:create_app",
+        factory=True,
+        host=os.environ.get("MCP_SERVER_HOST", "127.0.0.1"),
+        port=int(os.environ.get("MCP_SERVER_PORT", "8001")),
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_graceful_shutdown=int(os.environ.get("MCP_GRACEFUL_TIMEOUT", "30")),
+        timeout_keep_alive=int(os.environ.get("MCP_KEEPALIVE_TIMEOUT", "30")),
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
@@ -1,32 +1,39 @@
 """MCP server entry point using FastMCP with stateless HTTP transport."""
 
+import asyncio
+import os
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
 from mcp.server.fastmcp import FastMCP
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
+from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
-import os
+from mcp_server.cache import start_invalidation_listener, stop_invalidation_listener, tool_cache
+from mcp_server.database import dispose_engine, init_engine, pool_stats
+from mcp_server.metrics import MetricsMiddleware, metrics_endpoint
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[dict]:
-    """Lifespan manager for database connection pool."""
-    database_url = os.environ.get("DATABASE_URL", "")
-    engine = create_async_engine(database_url, echo=False, pool_pre_ping=True)
-    session_maker = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    try:
-        yield {"db_session_maker": session_maker}
-    finally:
-        await engine.dispose()
+    """Hand the shared database pool to tool calls.
+
+    In stateless HTTP mode this runs for every request, so it only looks up
+    the process-wide engine (created and warmed up on first use) and never
+    disposes it.
+    """
+    engine, session_maker = await init_engine()
+    yield {"db_engine": engine, "db_session_maker": session_maker}
 
 
 # Create FastMCP server instance
 mcp_server = FastMCP(
     "Todoo Task Manager",
+    # Binding to a non-loopback host also turns off FastMCP's localhost-only Host check
+    host=os.environ.get("MCP_SERVER_HOST", "127.0.0.1"),
     stateless_http=True,
     lifespan=app_lifespan,
 )
@@ -36,6 +43,67 @@ from mcp_server.tools.task_tools import register_task_tools
 
 register_task_tools(mcp_server)
 
+
+mcp_server.custom_route("/metrics", methods=["GET"])(metrics_endpoint)
+
+
+@mcp_server.custom_route("/metrics/pool", methods=["GET"])
+async def pool_metrics(request: Request) -> JSONResponse:
+    """Connection pool gauges for this worker process."""
+    return JSONResponse(pool_stats())
+
+
+@mcp_server.custom_route("/metrics/cache", methods=["GET"])
+async def cache_metrics(request: Request) -> JSONResponse:
+    """Tool-result cache counters for this worker process."""
+    return JSONResponse(tool_cache.stats())
+
+
+@mcp_server.custom_route("/healthz", methods=["GET"])
+async def liveness(request: Request) -> JSONResponse:
+    """Liveness probe: the worker's event loop is serving requests."""
+    return JSONResponse({"status": "ok"})
+
+
+@mcp_server.custom_route("/readyz", methods=["GET"])
+async def readiness(request: Request) -> JSONResponse:
+    """Readiness probe: the worker can reach the database."""
+    try:
+        async with asyncio.timeout(2):
+            engine, _ = await init_engine()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return JSONResponse({"status": "unavailable", "detail": type(e).__name__}, status_code=503)
+    return JSONResponse({"status": "ready", "pool": pool_stats()})
+
+
+def create_app() -> Starlette:
+    """Build the streamable HTTP ASGI app for one worker process.
+
+    The database pool is created and warmed up, and the tool cache starts
+    listening for task changes, before the worker accepts traffic; both are
+    released after in-flight requests have drained.
+    """
+    app = mcp_server.streamable_http_app()
+    session_manager_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        engine, _ = await init_engine()
+        await start_invalidation_listener(engine)
+        try:
+            async with session_manager_lifespan(app):
+                yield
+        finally:
+            await stop_invalidation_listener()
+            await dispose_engine()
+
+    app.router.lifespan_context = lifespan
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
 # Configure CORS to allow requests from OpenAI's hosted agent service
 _app = mcp_server._mcp_server if hasattr(mcp_server, '_mcp_server') else None
 if hasattr(mcp_server, 'settings') and hasattr(mcp_server.settings, 'app'):
@@ -1,30 +1,209 @@
 """MCP tools for task management operations."""
 
+import base64
 import json
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.types import TextContent
 from mcp.server.fastmcp.exceptions import ToolError
 
-from sqlalchemy import select, update, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from sqlalchemy import Executable, Row, select, update, delete, insert, func, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 # Import will be done relative to backend/ root
 from app.models.task import Task
+from mcp_server.cache import cached_tool, invalidates_cache
+from mcp_server.metrics import measured_tool
+from mcp_server.tracing import traced_tool
 
 
 async def _get_db_session(ctx: Context) -> AsyncSession:
-    """Get a database session from the MCP server's lifespan context."""
+    """Get a database session from the MCP server's lifespan context.
+
+    Every tool call gets its own session, and therefore its own connection
+    and transaction, so parallel tool calls from one agent step never share
+    state.
+    """
     session_maker = ctx.request_context.lifespan_context["db_session_maker"]
     return session_maker()
 
 
+def _get_engine(ctx: Context) -> AsyncEngine:
+    """Get the database engine from the MCP server's lifespan context.
+
+    Single-statement tools run on one connection checkout from the engine
+    (`engine.begin()`), without an ORM session around it.
+    """
+    return ctx.request_context.lifespan_context["db_engine"]
+
+
+def _task_condition(user_id: str, task_id: str, task_title: str) -> ColumnElement[bool] | None:
+    """WHERE clause selecting one of the user's tasks by ID, or else by title.
+
+    Titles match exactly but case-insensitively, the same rule as the batch
+    tools. Title matches go through a scalar subquery, so a title shared by
+    several tasks makes the statement fail instead of touching all of them.
+    Returns None for a malformed task ID, which can never match.
+    """
+    if task_id and task_id.strip():
+        try:
+            return and_(Task.user_id == user_id, Task.id == str(UUID(task_id.strip())))
+        except ValueError:
+            return None
+    if task_title and task_title.strip():
+        match = (
+            select(Task.id)
+            .where(Task.user_id == user_id, func.lower(Task.title) == task_title.strip().lower())
+            .scalar_subquery()
+        )
+        return and_(Task.user_id == user_id, Task.id == match)
+    raise ToolError("Either task_id or task_title must be provided")
+
+
+async def _execute_one(ctx: Context, stmt: Executable) -> Row | None:
+    """Run one statement in its own transaction and return its first row."""
+    async with _get_engine(ctx).begin() as conn:
+        result = await conn.execute(stmt)
+        return result.first()
+
+
+def _not_found(task_id: str, task_title: str) -> str:
+    """Build the not-found tool response for a task lookup."""
+    if task_id and task_id.strip():
+        return json.dumps({
+            "success": False,
+            "error": f"Task with id '{task_id}' not found",
+        })
+    return json.dumps({
+        "success": False,
+        "error": f"Task with title '{task_title}' not found",
+    })
+
+
+# Largest number of items accepted by a single batch tool call
+MAX_BATCH_SIZE = 50
+
+# list_tasks page sizes and the cap on the serialized task list
+DEFAULT_LIST_LIMIT = 20
+MAX_LIST_LIMIT = 100
+MAX_LIST_RESPONSE_CHARS = 8000
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so user text is matched literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _encode_cursor(created_at: datetime, task_id: str) -> str:
+    """Encode a keyset position (created_at, id) as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{task_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str] | None:
+    """Decode a cursor from _encode_cursor, or None if it is malformed."""
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), str(UUID(task_id))
+    except ValueError:
+        return None
+
+
+class NewTask(BaseModel):
+    """A task to create with the add_tasks batch tool."""
+
+    title: str = Field(description="The title of the task (required, max 200 characters)")
+    description: str = Field(default="", description="Optional description of the task")
+
+
+def _check_batch_size(count: int) -> None:
+    if count == 0:
+        raise ToolError("Provide at least one task")
+    if count > MAX_BATCH_SIZE:
+        raise ToolError(f"At most {MAX_BATCH_SIZE} tasks can be handled in one call")
+
+
+async def _resolve_tasks(
+    session: AsyncSession,
+    user_id: str,
+    task_ids: list[str],
+    task_titles: list[str],
+) -> list[dict]:
+    """Resolve batch references to single tasks with one locking SELECT.
+
+    Returns one result per reference, in input order. Resolved references
+    carry the task's "id" and "title"; the rest carry an "error". A title
+    that matches several tasks is reported as ambiguous rather than guessed.
+    """
+    valid_ids = {}
+    for raw in task_ids:
+        try:
+            valid_ids[raw] = str(UUID(raw.strip()))
+        except ValueError:
+            pass
+    titles = {raw: raw.strip().lower() for raw in task_titles if raw.strip()}
+
+    conditions = []
+    if valid_ids:
+        conditions.append(Task.id.in_(set(valid_ids.values())))
+    if titles:
+        conditions.append(func.lower(Task.title).in_(set(titles.values())))
+
+    by_id: dict[str, tuple[str, str]] = {}
+    by_title: dict[str, list[tuple[str, str]]] = {}
+    if conditions:
+        result = await session.execute(
+            select(Task.id, Task.title)
+            .where(Task.user_id == user_id, or_(*conditions))
+            .with_for_update()
+        )
+        for task_id, title in result.all():
+            by_id[task_id] = (task_id, title)
+            by_title.setdefault(title.lower(), []).append((task_id, title))
+
+    resolved = []
+    for raw in task_ids:
+        match = by_id.get(valid_ids.get(raw, ""))
+        if match:
+            resolved.append({"input": raw, "id": match[0], "title": match[1]})
+        else:
+            resolved.append({"input": raw, "error": f"Task with id '{raw}' not found"})
+    for raw in task_titles:
+        matches = by_title.get(titles.get(raw, ""), [])
+        if len(matches) == 1:
+            resolved.append({"input": raw, "id": matches[0][0], "title": matches[0][1]})
+        elif matches:
+            resolved.append({
+                "input": raw,
+                "error": f"Several tasks are titled '{raw}'; use task IDs instead",
+            })
+        else:
+            resolved.append({"input": raw, "error": f"Task with title '{raw}' not found"})
+    return resolved
+
+
+def _batch_response(results: list[dict]) -> str:
+    """Build the JSON response of a batch tool from its per-item results."""
+    succeeded = sum(1 for r in results if r["success"])
+    return json.dumps({
+        "success": succeeded == len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    })
+
+
 def register_task_tools(mcp: FastMCP) -> None:
     """Register all task management tools with the MCP server."""
 
     @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
     async def add_task(
         user_id: str,
         title: str,
@@ -44,82 +223,123 @@ def register_task_tools(mcp: FastMCP) -> None:
         if len(title) > 200:
             raise ToolError("Task title must be 200 characters or fewer")
 
-        session = await _get_db_session(ctx)
         try:
-            task = Task(
-                id=str(uuid4()),
-                user_id=user_id,
-                title=title.strip(),
-                description=description.strip() if description else None,
+            task = await _execute_one(
+                ctx,
+                insert(Task)
+                .values(
+                    id=str(uuid4()),
+                    user_id=user_id,
+                    title=title.strip(),
+                    description=description.strip() if description else None,
+                )
+                .returning(Task.id, Task.title, Task.description, Task.completed),
             )
-            session.add(task)
-            await session.commit()
-            await session.refresh(task)
-
-            return json.dumps({
-                "success": True,
-                "task": {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "completed": task.completed,
-                },
-            })
         except Exception as e:
-            await session.rollback()
             raise ToolError(f"Failed to create task: {str(e)}")
-        finally:
-            await session.close()
+
+        return json.dumps({
+            "success": True,
+            "task": {
+                "id": task.id,
+                "title": task.title,
+                "description": task.description,
+                "completed": task.completed,
+            },
+        })
 
     @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @cached_tool
     async def list_tasks(
         user_id: str,
         filter: str = "all",
+        limit: int = DEFAULT_LIST_LIMIT,
+        cursor: str = "",
+        query: str = "",
+        include_description: bool = False,
         ctx: Context = None,
     ) -> str:
-        """List the user's tasks.
+        """List the user's tasks, newest first, one page at a time.
+
+        Returns compact entries (id, title, completed). When "has_more" is
+        true, call again with "next_cursor" as cursor to get the next page.
 
         Args:
             user_id: The ID of the user whose tasks to list
             filter: Filter by status - "all", "completed", or "incomplete"
+            limit: Maximum number of tasks to return (1-100, default 20)
+            cursor: The next_cursor value from a previous call, to continue listing
+            query: Only return tasks whose title contains this text
+            include_description: Also return each task's description
         """
+        limit = max(1, min(limit, MAX_LIST_LIMIT))
         session = await _get_db_session(ctx)
         try:
-            query = select(Task).where(Task.user_id == user_id)
+            columns = [Task.id, Task.title, Task.completed, Task.created_at]
+            if include_description:
+                columns.append(Task.description)
+            stmt = select(*columns).where(Task.user_id == user_id)
 
             if filter == "completed":
-                query = query.where(Task.completed == True)  # noqa: E712
+                stmt = stmt.where(Task.completed == True)  # noqa: E712
             elif filter == "incomplete":
-                query = query.where(Task.completed == False)  # noqa: E712
-
-            query = query.order_by(Task.created_at.desc())
-            result = await session.execute(query)
-            tasks = result.scalars().all()
-
-            task_list = []
-            for t in tasks:
-                task_list.append({
-                    "id": t.id,
-                    "title": t.title,
-                    "description": t.description,
-                    "completed": t.completed,
-                })
+                stmt = stmt.where(Task.completed == False)  # noqa: E712
 
-            return json.dumps({
-                "success": True,
-                "count": len(task_list),
-                "filter": filter,
-                "tasks": task_list,
-            })
+            if query and query.strip():
+                stmt = stmt.where(
+                    Task.title.ilike(f"%{_escape_like(query.strip())}%", escape="\\")
+                )
+
+            if cursor:
+                position = _decode_cursor(cursor)
+                if position is None:
+                    raise ToolError("Invalid cursor; start again without one")
+                stmt = stmt.where(tuple_(Task.created_at, Task.id) < position)
+
+            stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+            rows = (await session.execute(stmt)).all()
         finally:
             await session.close()
 
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        task_list = []
+        size = 0
+        for row in rows:
+            entry = {"id": row.id, "title": row.title, "completed": row.completed}
+            if include_description:
+                entry["description"] = row.description
+            size += len(json.dumps(entry, separators=(",", ":")))
+            if task_list and size > MAX_LIST_RESPONSE_CHARS:
+                has_more = True
+                break
+            task_list.append(entry)
+
+        response = {
+            "success": True,
+            "count": len(task_list),
+            "filter": filter,
+            "tasks": task_list,
+            "has_more": has_more,
+        }
+        if has_more:
+            last = rows[len(task_list) - 1]
+            response["next_cursor"] = _encode_cursor(last.created_at, last.id)
+        return json.dumps(response, separators=(",", ":"))
+
     @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
     async def update_task(
         user_id: str,
-        task_title: str,
+        task_title: str = "",
         new_title: str = "",
         new_description: str = "",
+        task_id: str = "",
         ctx: Context = None,
     ) -> str:
         """Update an existing task's title or description.
@@ -127,53 +347,53 @@ def register_task_tools(mcp: FastMCP) -> None:
         Args:
             user_id: The ID of the user who owns the task
             task_title: The current title of the task to find and update
+            task_id: The ID of the task to update (preferred over task_title when known)
             new_title: The new title for the task (leave empty to keep current)
             new_description: The new description (leave empty to keep current)
         """
-        session = await _get_db_session(ctx)
-        try:
-            # Find the task by title (case-insensitive match)
-            result = await session.execute(
-                select(Task).where(
-                    Task.user_id == user_id,
-                    Task.title.ilike(task_title.strip()),
-                )
-            )
-            task = result.scalar_one_or_none()
-
-            if not task:
-                return json.dumps({
-                    "success": False,
-                    "error": f"Task with title '{task_title}' not found",
-                })
-
-            if new_title and new_title.strip():
-                task.title = new_title.strip()
-            if new_description is not None and new_description != "":
-                task.description = new_description.strip() if new_description.strip() else None
-
-            await session.commit()
-            await session.refresh(task)
+        # Find the task by ID, or by title (case-insensitive match)
+        condition = _task_condition(user_id, task_id, task_title)
+        if condition is None:
+            return _not_found(task_id, task_title)
+
+        values = {}
+        if new_title and new_title.strip():
+            values["title"] = new_title.strip()
+        if new_description is not None and new_description != "":
+            values["description"] = new_description.strip() if new_description.strip() else None
+
+        columns = (Task.id, Task.title, Task.description, Task.completed)
+        if values:
+            stmt = update(Task).where(condition).values(**values).returning(*columns)
+        else:
+            stmt = select(*columns).where(condition)
 
-            return json.dumps({
-                "success": True,
-                "task": {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "completed": task.completed,
-                },
-            })
+        try:
+            task = await _execute_one(ctx, stmt)
         except Exception as e:
-            await session.rollback()
             raise ToolError(f"Failed to update task: {str(e)}")
-        finally:
-            await session.close()
+
+        if not task:
+            return _not_found(task_id, task_title)
+
+        return json.dumps({
+            "success": True,
+            "task": {
+                "id": task.id,
+                "title": task.title,
+                "description": task.description,
+                "completed": task.completed,
+            },
+        })
 
     @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
     async def complete_task(
         user_id: str,
-        task_title: str,
+        task_title: str = "",
+        task_id: str = "",
         ctx: Context = None,
     ) -> str:
         """Mark a task as completed.
@@ -181,45 +401,43 @@ def register_task_tools(mcp: FastMCP) -> None:
         Args:
             user_id: The ID of the user who owns the task
             task_title: The title of the task to mark as complete
+            task_id: The ID of the task to complete (preferred over task_title when known)
         """
-        session = await _get_db_session(ctx)
+        condition = _task_condition(user_id, task_id, task_title)
+        if condition is None:
+            return _not_found(task_id, task_title)
+
         try:
-            result = await session.execute(
-                select(Task).where(
-                    Task.user_id == user_id,
-                    Task.title.ilike(task_title.strip()),
-                )
+            task = await _execute_one(
+                ctx,
+                update(Task)
+                .where(condition)
+                .values(completed=True)
+                .returning(Task.id, Task.title, Task.completed),
             )
-            task = result.scalar_one_or_none()
-
-            if not task:
-                return json.dumps({
-                    "success": False,
-                    "error": f"Task with title '{task_title}' not found",
-                })
-
-            task.completed = True
-            await session.commit()
-            await session.refresh(task)
-
-            return json.dumps({
-                "success": True,
-                "task": {
-                    "id": task.id,
-                    "title": task.title,
-                    "completed": task.completed,
-                },
-            })
         except Exception as e:
-            await session.rollback()
             raise ToolError(f"Failed to complete task: {str(e)}")
-        finally:
-            await session.close()
+
+        if not task:
+            return _not_found(task_id, task_title)
+
+        return json.dumps({
+            "success": True,
+            "task": {
+                "id": task.id,
+                "title": task.title,
+                "completed": task.completed,
+            },
+        })
 
     @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
     async def delete_task(
         user_id: str,
-        task_title: str,
+        task_title: str = "",
+        task_id: str = "",
         ctx: Context = None,
     ) -> str:
         """Delete a task permanently.
@@ -227,33 +445,194 @@ def register_task_tools(mcp: FastMCP) -> None:
         Args:
             user_id: The ID of the user who owns the task
             task_title: The title of the task to delete
+            task_id: The ID of the task to delete (preferred over task_title when known)
         """
-        session = await _get_db_session(ctx)
+        condition = _task_condition(user_id, task_id, task_title)
+        if condition is None:
+            return _not_found(task_id, task_title)
+
         try:
-            result = await session.execute(
-                select(Task).where(
-                    Task.user_id == user_id,
-                    Task.title.ilike(task_title.strip()),
-                )
+            task = await _execute_one(
+                ctx,
+                delete(Task).where(condition).returning(Task.title),
             )
-            task = result.scalar_one_or_none()
+        except Exception as e:
+            raise ToolError(f"Failed to delete task: {str(e)}")
 
-            if not task:
-                return json.dumps({
+        if not task:
+            return _not_found(task_id, task_title)
+
+        return json.dumps({
+            "success": True,
+            "deleted_task": task.title,
+        })
+
+    @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
+    async def add_tasks(
+        user_id: str,
+        tasks: list[NewTask],
+        ctx: Context = None,
+    ) -> str:
+        """Add several tasks for the user at once. Prefer this over repeated add_task calls.
+
+        Args:
+            user_id: The ID of the user who owns the tasks
+            tasks: The tasks to create, each with a title and optional description
+        """
+        _check_batch_size(len(tasks))
+
+        results = []
+        rows = []
+        for item in tasks:
+            title = item.title.strip() if item.title else ""
+            if not title:
+                results.append({
+                    "input": item.title,
+                    "success": False,
+                    "error": "Task title cannot be empty",
+                })
+                continue
+            if len(title) > 200:
+                results.append({
+                    "input": item.title,
                     "success": False,
-                    "error": f"Task with title '{task_title}' not found",
+                    "error": "Task title must be 200 characters or fewer",
                 })
+                continue
+            results.append(None)
+            rows.append({
+                "id": str(uuid4()),
+                "user_id": user_id,
+                "title": title,
+                "description": item.description.strip() if item.description else None,
+            })
+
+        created = []
+        if rows:
+            session = await _get_db_session(ctx)
+            try:
+                result = await session.execute(
+                    insert(Task).returning(
+                        Task.id,
+                        Task.title,
+                        Task.description,
+                        Task.completed,
+                        sort_by_parameter_order=True,
+                    ),
+                    rows,
+                )
+                created = result.all()
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise ToolError(f"Failed to create tasks: {str(e)}")
+            finally:
+                await session.close()
+
+        created_iter = iter(created)
+        for index, item in enumerate(results):
+            if item is None:
+                task = next(created_iter)
+                results[index] = {
+                    "input": task.title,
+                    "success": True,
+                    "task": {
+                        "id": task.id,
+                        "title": task.title,
+                        "description": task.description,
+                        "completed": task.completed,
+                    },
+                }
+        return _batch_response(results)
 
-            task_title_deleted = task.title
-            await session.delete(task)
+    @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
+    async def complete_tasks(
+        user_id: str,
+        task_ids: list[str] | None = None,
+        task_titles: list[str] | None = None,
+        ctx: Context = None,
+    ) -> str:
+        """Mark several tasks as completed at once. Prefer this over repeated complete_task calls.
+
+        Args:
+            user_id: The ID of the user who owns the tasks
+            task_ids: IDs of the tasks to complete (preferred when known)
+            task_titles: Titles of the tasks to complete
+        """
+        task_ids = task_ids or []
+        task_titles = task_titles or []
+        _check_batch_size(len(task_ids) + len(task_titles))
+
+        session = await _get_db_session(ctx)
+        try:
+            resolved = await _resolve_tasks(session, user_id, task_ids, task_titles)
+            ids = {r["id"] for r in resolved if "id" in r}
+            if ids:
+                await session.execute(
+                    update(Task)
+                    .where(Task.user_id == user_id, Task.id.in_(ids))
+                    .values(completed=True)
+                )
             await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise ToolError(f"Failed to complete tasks: {str(e)}")
+        finally:
+            await session.close()
 
-            return json.dumps({
+        return _batch_response([
+            {
+                "input": r["input"],
                 "success": True,
-                "deleted_task": task_title_deleted,
-            })
+                "task": {"id": r["id"], "title": r["title"], "completed": True},
+            } if "id" in r else {"input": r["input"], "success": False, "error": r["error"]}
+            for r in resolved
+        ])
+
+    @mcp.tool()
+    @measured_tool
+    @traced_tool
+    @invalidates_cache
+    async def delete_tasks(
+        user_id: str,
+        task_ids: list[str] | None = None,
+        task_titles: list[str] | None = None,
+        ctx: Context = None,
+    ) -> str:
+        """Delete several tasks permanently at once. Prefer this over repeated delete_task calls.
+
+        Args:
+            user_id: The ID of the user who owns the tasks
+            task_ids: IDs of the tasks to delete (preferred when known)
+            task_titles: Titles of the tasks to delete
+        """
+        task_ids = task_ids or []
+        task_titles = task_titles or []
+        _check_batch_size(len(task_ids) + len(task_titles))
+
+        session = await _get_db_session(ctx)
+        try:
+            resolved = await _resolve_tasks(session, user_id, task_ids, task_titles)
+            ids = {r["id"] for r in resolved if "id" in r}
+            if ids:
+                await session.execute(
+                    delete(Task).where(Task.user_id == user_id, Task.id.in_(ids))
+                )
+            await session.commit()
         except Exception as e:
             await session.rollback()
-            raise ToolError(f"Failed to delete task: {str(e)}")
+            raise ToolError(f"Failed to delete tasks: {str(e)}")
         finally:
             await session.close()
+
+        return _batch_response([
+            {"input": r["input"], "success": True, "deleted_task": r["title"]}
+            if "id" in r else {"input": r["input"], "success": False, "error": r["error"]}
+            for r in resolved
+        ])
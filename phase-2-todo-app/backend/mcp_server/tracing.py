@@ -0,0 +1,121 @@
+"""Tool-call spans for the MCP server, nested under the calling chat turn.
+
+The backend sends its trace context in the `x-todoo-trace-id` and
+`x-todoo-parent-span-id` headers. Each tool call is recorded as a span with
+that trace ID and parent, in the same shape as the agents SDK's exported
+spans, so both sides can be merged into one trace. Calls without trace
+headers are not recorded.
+
+The exporter is selected with the MCP_TRACING_EXPORTER environment variable:
+"console" (one JSON line per span on stdout), "memory" (most recent spans in
+process, see `memory_exporter`) or "none" (default).
+"""
+
+import functools
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any, ParamSpec, TypeVar
+from uuid import uuid4
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+TRACE_ID_HEADER = "x-todoo-trace-id"
+PARENT_SPAN_HEADER = "x-todoo-parent-span-id"
+
+logger = logging.getLogger(__name__)
+
+
+class ConsoleSpanExporter:
+    """Writes each finished span as one JSON line to stdout."""
+
+    def export(self, span: dict[str, Any]) -> None:
+        print(json.dumps(span), flush=True)
+
+
+class InMemorySpanExporter:
+    """Keeps the most recently finished spans for local inspection."""
+
+    def __init__(self, max_items: int = 1000):
+        self._items: deque[dict[str, Any]] = deque(maxlen=max_items)
+
+    def export(self, span: dict[str, Any]) -> None:
+        self._items.append(span)
+
+    def items(self) -> list[dict[str, Any]]:
+        """Exported spans, oldest first."""
+        return list(self._items)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+memory_exporter = InMemorySpanExporter()
+
+
+def _select_exporter() -> ConsoleSpanExporter | InMemorySpanExporter | None:
+    name = os.environ.get("MCP_TRACING_EXPORTER", "none")
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "memory":
+        return memory_exporter
+    if name != "none":
+        logger.warning("Unknown MCP_TRACING_EXPORTER %r, tracing disabled", name)
+    return None
+
+
+_exporter = _select_exporter()
+
+
+def _incoming_context(ctx: Any) -> tuple[str | None, str | None]:
+    """Read the caller's trace ID and parent span ID from the HTTP request."""
+    request = getattr(getattr(ctx, "request_context", None), "request", None)
+    headers = getattr(request, "headers", None)
+    if headers is None:
+        return None, None
+    return headers.get(TRACE_ID_HEADER), headers.get(PARENT_SPAN_HEADER)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def traced_tool(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """Record each call of an MCP tool as a span of the caller's trace.
+
+    Apply below `@mcp.tool()`; the wrapped signature is preserved so FastMCP
+    still builds the tool schema and injects the Context from it.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        trace_id, parent_id = (None, None)
+        if _exporter is not None:
+            trace_id, parent_id = _incoming_context(kwargs.get("ctx"))
+        if trace_id is None:
+            return await func(*args, **kwargs)
+
+        span = {
+            "object": "trace.span",
+            "id": f"span_{uuid4().hex[:24]}",
+            "trace_id": trace_id,
+            "parent_id": parent_id,
+            "started_at": _now(),
+            "ended_at": None,
+            "span_data": {"type": "custom", "name": f"mcp.{func.__name__}", "data": {}},
+            "error": None,
+        }
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            span["error"] = {"message": type(e).__name__, "data": {"detail": str(e)}}
+            raise
+        finally:
+            span["ended_at"] = _now()
+            _exporter.export(span)
+
+    return wrapper
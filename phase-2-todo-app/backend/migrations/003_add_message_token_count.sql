@@ -0,0 +1,14 @@
+-- Migration: Add cached token counts to messages
+-- Date: 2026-10-19
+-- Feature: Token-budget conversation history
+
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS token_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill existing rows with the same estimate the backend uses
+-- (4 tokens of per-message overhead + ~4 characters per token)
+UPDATE messages
+SET token_count = 4 + (length(content) + 3) / 4
+WHERE token_count = 0;
+
+-- Rollback migration (run manually if needed)
+-- ALTER TABLE messages DROP COLUMN IF EXISTS token_count;
@@ -0,0 +1,18 @@
+-- Migration: Create conversation_summaries table
+-- Date: 2026-10-19
+-- Feature: Rolling conversation summaries
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    conversation_id UUID PRIMARY KEY REFERENCES conversations(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    token_count INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    summarized_through TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_summaries_user_id ON conversation_summaries(user_id);
+
+-- Rollback migration (run manually if needed)
+-- DROP TABLE IF EXISTS conversation_summaries;
@@ -0,0 +1,23 @@
+-- Migration: Create turn_usage table
+-- Date: 2026-10-19
+-- Feature: Token usage and model latency accounting
+
+CREATE TABLE IF NOT EXISTS turn_usage (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    message_id UUID NOT NULL UNIQUE REFERENCES messages(id) ON DELETE CASCADE,
+    conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    model VARCHAR(100) NOT NULL,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    model_requests INTEGER NOT NULL DEFAULT 0,
+    model_latency_ms INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_turn_usage_user_created ON turn_usage(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_turn_usage_conversation ON turn_usage(conversation_id);
+
+-- Rollback migration (run manually if needed)
+-- DROP TABLE IF EXISTS turn_usage;
@@ -0,0 +1,28 @@
+-- Migration: Notify listeners of task changes
+-- Date: 2026-10-19
+-- Feature: MCP tool-result cache invalidation
+
+-- Each MCP worker LISTENs on this channel and drops the cached tool results
+-- of the user whose tasks changed, whichever service made the change.
+-- Identical notifications within one transaction are delivered once.
+CREATE OR REPLACE FUNCTION notify_task_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('todoo_task_changes', OLD.user_id::text);
+    ELSE
+        PERFORM pg_notify('todoo_task_changes', NEW.user_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_notify_change ON tasks;
+CREATE TRIGGER tasks_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON tasks
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_task_change();
+
+-- Rollback migration (run manually if needed)
+-- DROP TRIGGER IF EXISTS tasks_notify_change ON tasks;
+-- DROP FUNCTION IF EXISTS notify_task_change();
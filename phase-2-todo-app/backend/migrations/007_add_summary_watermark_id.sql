@@ -0,0 +1,9 @@
+-- Migration: Track the last summarized message ID on conversation summaries
+-- Date: 2026-10-19
+-- Feature: Rolling conversation summaries
+
+-- Messages of one turn can share created_at; the ID breaks the tie
+ALTER TABLE conversation_summaries ADD COLUMN IF NOT EXISTS summarized_through_id UUID;
+
+-- Rollback migration (run manually if needed)
+-- ALTER TABLE conversation_summaries DROP COLUMN IF EXISTS summarized_through_id;